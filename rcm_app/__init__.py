@@ -1,3 +1,4 @@
+import logging
 import os
 from datetime import timedelta
 from flask import Flask, jsonify
@@ -5,21 +6,27 @@ from flask_cors import CORS
 from .extensions import db, jwt
 from .settings import AppConfig
 from .api import register_blueprints
-from sqlalchemy import text
+from .utils.json_provider import OrjsonProvider, orjson
+from .utils.sqlite import optimize_at_exit, optimize_sqlite
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 
 
 def create_app(config: AppConfig | None = None) -> Flask:
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     cfg = config or AppConfig.from_env()
     app.config.update(
         SQLALCHEMY_DATABASE_URI=cfg.database_url,
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        SQLALCHEMY_ENGINE_OPTIONS={"implicit_returning": False},
+        SQLALCHEMY_ENGINE_OPTIONS=_engine_options(cfg.database_url),
         JWT_SECRET_KEY=cfg.jwt_secret_key,
         JWT_ACCESS_TOKEN_EXPIRES=timedelta(minutes=cfg.jwt_access_minutes),
         JWT_DECODE_LEEWAY=10,
         MAX_CONTENT_LENGTH=cfg.max_upload_bytes,
+        UPLOAD_CHUNK_ROWS=cfg.upload_chunk_rows,
     )
 
     db.init_app(app)
@@ -44,6 +51,10 @@ def create_app(config: AppConfig | None = None) -> Flask:
 
     # Ensure SQLite directory exists and auto-create tables for local dev
     with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _set_sqlite_pragma)
+        # Refresh SQLite planner statistics and close pooled connections when the process exits
+        optimize_at_exit(db.engine)
         try:
             uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
             if uri.startswith("sqlite:///"):
@@ -68,20 +79,16 @@ def create_app(config: AppConfig | None = None) -> Flask:
                 app.logger.info(f"Successfully created {len(tables)} tables")
             
             _ensure_sqlite_pk_compat()
+            _ensure_indexes()
         except Exception as e:  # noqa: BLE001
             app.logger.exception(f"failed to auto-create tables: {e}")
             # Don't fail startup, but log the error
 
-    # Log available routes for debugging
-    with app.app_context():
-        try:
-            routes = sorted({
-                f"{rule.methods} {rule.rule}" for rule in app.url_map.iter_rules()
-            })
-            for r in routes:
-                app.logger.info("route: %s", r)
-        except Exception:  # noqa: BLE001
-            pass
+    # Log available routes: at INFO when LOG_ROUTES=1, otherwise at DEBUG in debug mode only
+    if os.getenv("LOG_ROUTES") == "1":
+        _log_routes(app, logging.INFO)
+    elif app.debug:
+        _log_routes(app, logging.DEBUG)
 
     @app.get("/health")
     def health() -> tuple[dict, int]:
@@ -93,31 +100,85 @@ def create_app(config: AppConfig | None = None) -> Flask:
     return app
 
 
+# Database URI -> PRAGMA schema_version last verified by _ensure_sqlite_pk_compat
+_PK_CHECKED_SCHEMA_VERSION: dict[str, int] = {}
+
+
+def _log_routes(app: Flask, level: int) -> None:
+    """Log every URL rule at level, lowering the app logger to level meanwhile if it would drop them."""
+    previous = app.logger.level
+    if not app.logger.isEnabledFor(level):
+        app.logger.setLevel(level)
+    try:
+        for rule in app.url_map.iter_rules():
+            app.logger.log(level, "route: %s %s", rule.methods, rule.rule)
+    finally:
+        app.logger.setLevel(previous)
+
+
+def _engine_options(database_url: str) -> dict:
+    """Engine options: long-lived pooled connections, checked before reuse."""
+    options = {"implicit_returning": False, "pool_pre_ping": True, "pool_recycle": 3600}
+    url = make_url(database_url)
+    # In-memory SQLite runs on a single static connection, which takes no pool sizing
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options.update(pool_size=20, max_overflow=10)
+    return options
+
+
+def _set_sqlite_pragma(dbapi_conn, _connection_record) -> None:
+    """Give each new SQLite connection WAL journaling and a large in-memory page cache."""
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA cache_size=-65536")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.close()
+
+
+def _ensure_indexes() -> None:
+    """Create model indexes missing from tables that predate them.
+
+    db.create_all() skips existing tables, so indexes added to a model later
+    would otherwise never reach an existing database.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
 def _ensure_sqlite_pk_compat() -> None:
     """Ensure SQLite has INTEGER PRIMARY KEY for autoincrement IDs.
 
-    If legacy schema exists (e.g., BIGINT), drop and recreate tables.
+    If legacy schema exists (e.g., BIGINT), drop and recreate tables. The
+    check is skipped while PRAGMA schema_version (bumped by every DDL change)
+    matches the last version verified in this process. Planner statistics are
+    refreshed once the schema is settled.
     """
     uri = db.engine.url.render_as_string(hide_password=False)
     if not uri.startswith("sqlite"):
         return
     try:
-        res = db.session.execute(text("PRAGMA table_info('claims_master')")).fetchall()
-        if not res:
+        schema_version = db.session.execute(text("PRAGMA schema_version")).scalar()
+        if _PK_CHECKED_SCHEMA_VERSION.get(uri) == schema_version:
             return
+        res = db.session.execute(text("PRAGMA table_info('claims_master')")).fetchall()
         cols = {row[1]: row for row in res}  # name -> row
         id_row = cols.get("id")
-        if not id_row:
-            return
-        col_type = (id_row[2] or "").upper()
-        is_pk = bool(id_row[5])
-        if col_type != "INTEGER" or not is_pk:
-            # Drop and recreate all tables to fix schema
-            from flask import current_app
-            current_app.logger.warning("Recreating SQLite tables to ensure INTEGER PRIMARY KEY ids")
-            db.drop_all()
-            db.create_all()
+        if id_row:
+            col_type = (id_row[2] or "").upper()
+            is_pk = bool(id_row[5])
+            if col_type != "INTEGER" or not is_pk:
+                # Drop and recreate all tables to fix schema
+                from flask import current_app
+                current_app.logger.warning("Recreating SQLite tables to ensure INTEGER PRIMARY KEY ids")
+                db.drop_all()
+                db.create_all()
+                schema_version = db.session.execute(text("PRAGMA schema_version")).scalar()
+        _PK_CHECKED_SCHEMA_VERSION[uri] = schema_version
     except Exception:
         # Best-effort; continue
         pass
-
+    finally:
+        optimize_sqlite(db.engine)
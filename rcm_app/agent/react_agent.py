@@ -2,23 +2,119 @@
 ReAct AI Agent for RCM Validation
 """
 
+import asyncio
+import functools
 import json
+import re
+import threading
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from pydantic import BaseModel, Field, ValidationError
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import Tool
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
+from langchain.prompts import ChatPromptTemplate
 from rcm_app.models.models import Master
 from rcm_app.rules.loader import RulesBundle
+from rcm_app.utils.validators import is_valid_unique_id
 from .tools.validation_tools import ValidationTools
 from .tools.static_rules import StaticRulesTool
 from .tools.llm_queries import LLMQueryTool
 from .tools.database_queries import DatabaseQueryTool
 from .tools.external_api import ExternalAPITool
 
+# orjson parses in C; fall back to the stdlib parser when it is absent
+try:
+    import orjson
+    _json_loads = orjson.loads
+except Exception:  # noqa: BLE001
+    _json_loads = json.loads
 
-@dataclass
+# Outermost {...} span of the agent's final answer
+_JSON_SPAN_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Claims validated concurrently by validate_claims_batch; caps in-flight LLM requests
+AGENT_MAX_CONCURRENCY = 16
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_llm() -> ChatGoogleGenerativeAI:
+    """Chat model shared by every agent; built on first use"""
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0.1,
+        max_tokens=1000
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_tools() -> tuple:
+    """Session-independent tools (static rules, LLM query, external API) shared by every agent"""
+    return StaticRulesTool(), LLMQueryTool(), ExternalAPITool()
+
+
+@functools.lru_cache(maxsize=1)
+def _base_prompt() -> ChatPromptTemplate:
+    """ReAct prompt without the tenant rules text, parsed once"""
+    # Everything identical across claims (tools, format, rules) goes in the system message so it forms a
+    # stable prompt prefix the provider can cache; only the claim and scratchpad vary per call
+    return ChatPromptTemplate.from_messages([
+        ("system", """
+You are an expert RCM validation agent. Your task is to validate healthcare claims step-by-step using available tools.
+
+Available tools:
+{tools}
+
+Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of [{tool_names}]
+Action Input: the input to the action
+Observation: the result of the action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+
+Rules for validation:
+1. Check ID formats (national_id, member_id, facility_id, unique_id) - must be uppercase alphanumeric
+2. Validate unique_id format: first4(national_id)-middle4(member_id)-last4(facility_id) with hyphens
+3. Check service codes requiring approval: SRV1001, SRV1002, SRV2008
+4. Check diagnosis codes requiring approval: E11.9, R07.9, Z34.0
+5. Check paid amount threshold: > AED 250 requires approval
+6. Validate approval_number format: e.g., APP001 (invalid: NA, "Obtain approval")
+7. Use database queries for historical context when uncertain
+8. Use external API calls for approval verification
+9. Use LLM queries for nuanced explanations when needed
+
+For each claim, the Final Answer must be a single JSON object with exactly these keys:
+- status: "Validated" or "Not Validated"
+- error_type: "No error", "Technical", "Medical", or "Both"
+- error_explanation: list of specific error descriptions
+- recommended_action: list of actionable recommendations
+- confidence: float between 0.0 and 1.0
+
+Rules Context:
+{rules_text}
+"""),
+        ("human", """
+Question: {input}
+
+{agent_scratchpad}
+"""),
+    ])
+
+
+class AgentVerdict(BaseModel):
+    """Schema of the JSON object the agent's Final Answer must contain"""
+    status: str = "Not Validated"
+    error_type: str = "Technical"
+    error_explanation: List[str] = Field(default_factory=list)
+    recommended_action: List[str] = Field(default_factory=list)
+    confidence: float = 0.5
+
+
+@dataclass(slots=True, frozen=True)
 class AgentResult:
     """Result from AI agent validation"""
     claim_id: str
@@ -38,13 +134,13 @@ class RCMValidationAgent:
         self.tenant_id = tenant_id
         self.rules = rules
         self.validation_tools = ValidationTools(rules, session)
+        # Concurrent agent runs execute sync tools in worker threads; the session is not thread-safe
+        self._session_lock = threading.Lock()
+        # Raw agent output per claim signature (see _cache_key); the rules are fixed for this agent's lifetime
+        self._result_cache: Dict[tuple, Dict[str, Any]] = {}
         
         # Initialize LLM
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.1,
-            max_tokens=1000
-        )
+        self.llm = _shared_llm()
         
         # Create tools
         self.tools = self._create_tools()
@@ -55,9 +151,9 @@ class RCMValidationAgent:
     def _create_tools(self) -> List[Tool]:
         """Create tools for the agent"""
         tools = []
+        static_rules_tool, llm_query_tool, external_api_tool = _shared_tools()
         
         # Static rules tool
-        static_rules_tool = StaticRulesTool()
         tools.append(Tool(
             name="static_rules",
             description="Apply static business rules for service codes, diagnosis codes, and paid amounts",
@@ -65,7 +161,6 @@ class RCMValidationAgent:
         ))
         
         # LLM query tool
-        llm_query_tool = LLMQueryTool()
         tools.append(Tool(
             name="llm_query",
             description="Query LLM for nuanced error explanations and recommendations",
@@ -77,60 +172,22 @@ class RCMValidationAgent:
         tools.append(Tool(
             name="database_query",
             description="Query database for historical claim data and context",
-            func=lambda claim_id, tenant_id, query_type: db_query_tool._run(claim_id, tenant_id, query_type)
+            func=lambda claim_id, tenant_id, query_type: self._with_session(db_query_tool._run, claim_id, tenant_id, query_type)
         ))
         
         # External API tool
-        external_api_tool = ExternalAPITool()
         tools.append(Tool(
             name="external_api",
             description="Make mock external API calls for verification",
-            func=lambda approval_number, api_type: external_api_tool._run(approval_number, api_type)
+            func=lambda approval_number, api_type: external_api_tool._run(approval_number, api_type),
+            coroutine=lambda approval_number, api_type: external_api_tool._arun(approval_number, api_type)
         ))
         
         return tools
     
     def _create_agent(self) -> AgentExecutor:
         """Create the ReAct agent"""
-        prompt = PromptTemplate.from_template("""
-You are an expert RCM validation agent. Your task is to validate healthcare claims step-by-step using available tools.
-
-Available tools:
-{tools}
-
-Use the following format:
-
-Question: the input question you must answer
-Thought: you should always think about what to do
-Action: the action to take, should be one of [{tool_names}]
-Action Input: the input to the action
-Observation: the result of the action
-... (this Thought/Action/Action Input/Observation can repeat N times)
-Thought: I now know the final answer
-Final Answer: the final answer to the original input question
-
-Rules for validation:
-1. Check ID formats (national_id, member_id, facility_id, unique_id) - must be uppercase alphanumeric
-2. Validate unique_id format: first4(national_id)-middle4(member_id)-last4(facility_id) with hyphens
-3. Check service codes requiring approval: SRV1001, SRV1002, SRV2008
-4. Check diagnosis codes requiring approval: E11.9, R07.9, Z34.0
-5. Check paid amount threshold: > AED 250 requires approval
-6. Validate approval_number format: e.g., APP001 (invalid: NA, "Obtain approval")
-7. Use database queries for historical context when uncertain
-8. Use external API calls for approval verification
-9. Use LLM queries for nuanced explanations when needed
-
-For each claim, provide:
-- status: "Validated" or "Not Validated"
-- error_type: "No error", "Technical", "Medical", or "Both"
-- error_explanation: list of specific error descriptions
-- recommended_action: list of actionable recommendations
-- confidence: float between 0.0 and 1.0
-
-Question: {input}
-
-{agent_scratchpad}
-""")
+        prompt = _base_prompt().partial(rules_text=self.rules.raw_rules_text)
         
         agent = create_react_agent(
             llm=self.llm,
@@ -142,18 +199,18 @@ Question: {input}
             agent=agent,
             tools=self.tools,
             verbose=True,
-            max_iterations=10,
+            max_iterations=4,
             handle_parsing_errors=True
         )
     
-    def validate_claim(self, claim: Master) -> AgentResult:
-        """Validate a single claim using the AI agent"""
-        try:
-            # Prepare claim data
-            claim_data = self._claim_to_dict(claim)
-            
-            # Create input for agent
-            agent_input = f"""
+    def _with_session(self, func, *args):
+        """Run func while holding the session lock"""
+        with self._session_lock:
+            return func(*args)
+    
+    def _agent_input(self, claim: Master) -> str:
+        """Build the agent input for a claim"""
+        return f"""
 Validate this claim step-by-step:
 
 Claim ID: {claim.claim_id}
@@ -168,21 +225,100 @@ Service Code: {claim.service_code}
 Paid Amount AED: {claim.paid_amount_aed}
 Approval Number: {claim.approval_number}
 
-Rules Context:
-{self.rules.raw_rules_text}
-
 Please validate this claim using the available tools and provide a comprehensive analysis.
 """
+    
+    def _cache_key(self, claim: Master) -> tuple:
+        """Claim fields the agent's verdict depends on.
+
+        unique_id is the claim's own identifier, so only the outcomes of its
+        checks (shape, and match against the ID fields) are part of the key;
+        structurally identical claims share one agent run.
+        """
+        return (
+            claim.encounter_type,
+            claim.national_id,
+            claim.member_id,
+            claim.facility_id,
+            is_valid_unique_id(claim.unique_id or ""),
+            self.validation_tools._validate_unique_id_format(claim) is None,
+            tuple(sorted(claim.diagnosis_codes or ())),
+            claim.service_code,
+            str(claim.paid_amount_aed),
+            claim.approval_number,
+        )
+    
+    def _cached_result(self, claim: Master, key: tuple) -> AgentResult:
+        """Rebuild a claim's result from a cached agent run"""
+        result = self._parse_agent_result(claim.claim_id, self._result_cache[key])
+        return replace(result, agent_reasoning="[cache hit]")
+    
+    def _fast_verdict(self, claim: Master) -> Optional[AgentResult]:
+        """Result from the deterministic checks alone, or None when the agent is needed.
+
+        Conclusive when the ID formats pass and the static rules find at most
+        one error.
+        """
+        id_result = self.validation_tools.check_id_format(claim)
+        if not id_result.is_valid:
+            return None
+        rules_result = self.validation_tools.apply_static_rules(claim)
+        if len(rules_result.explanations) > 1:
+            return None
+        return AgentResult(
+            claim_id=claim.claim_id,
+            status="Validated" if rules_result.is_valid else "Not Validated",
+            error_type=rules_result.error_type,
+            error_explanation=rules_result.explanations,
+            recommended_action=rules_result.recommended_actions,
+            confidence=rules_result.confidence,
+            agent_reasoning="Deterministic checks were conclusive; agent not invoked"
+        )
+    
+    def validate_claim(self, claim: Master) -> AgentResult:
+        """Validate a single claim using the AI agent"""
+        try:
+            verdict = self._fast_verdict(claim)
+            if verdict is not None:
+                return verdict
+            
+            key = self._cache_key(claim)
+            if key in self._result_cache:
+                return self._cached_result(claim, key)
             
             # Run agent
-            result = self.agent.invoke({"input": agent_input})
+            result = self.agent.invoke({"input": self._agent_input(claim)})
+            self._result_cache[key] = result
             
             # Parse result
             return self._parse_agent_result(claim.claim_id, result)
             
         except Exception as e:
             # Fallback to basic validation
-            return self._fallback_validation(claim, str(e))
+            return self._with_session(self._fallback_validation, claim, str(e))
+    
+    async def _ainvoke(self, agent_input: str, semaphore: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """Run the agent asynchronously, holding semaphore (if given) for the whole run"""
+        if semaphore is None:
+            return await self.agent.ainvoke({"input": agent_input})
+        async with semaphore:
+            return await self.agent.ainvoke({"input": agent_input})
+    
+    async def avalidate_claim(self, claim: Master, semaphore: Optional[asyncio.Semaphore] = None) -> AgentResult:
+        """Async validate_claim; semaphore bounds concurrent agent runs"""
+        try:
+            verdict = self._fast_verdict(claim)
+            if verdict is not None:
+                return verdict
+            
+            key = self._cache_key(claim)
+            if key in self._result_cache:
+                return self._cached_result(claim, key)
+            result = await self._ainvoke(self._agent_input(claim), semaphore)
+            self._result_cache[key] = result
+            return self._parse_agent_result(claim.claim_id, result)
+        except Exception as e:
+            return self._with_session(self._fallback_validation, claim, str(e))
     
     def _claim_to_dict(self, claim: Master) -> Dict[str, Any]:
         """Convert claim model to dictionary"""
@@ -208,23 +344,16 @@ Please validate this claim using the available tools and provide a comprehensive
             final_answer = result.get("output", "")
             
             # Try to parse JSON from final answer
-            if "{" in final_answer and "}" in final_answer:
-                json_start = final_answer.find("{")
-                json_end = final_answer.rfind("}") + 1
-                json_str = final_answer[json_start:json_end]
-                
+            json_span = _JSON_SPAN_RE.search(final_answer)
+            if json_span:
                 try:
-                    parsed = json.loads(json_str)
+                    verdict = AgentVerdict.model_validate(_json_loads(json_span.group()))
                     return AgentResult(
                         claim_id=claim_id,
-                        status=parsed.get("status", "Not Validated"),
-                        error_type=parsed.get("error_type", "Technical"),
-                        error_explanation=parsed.get("error_explanation", []),
-                        recommended_action=parsed.get("recommended_action", []),
-                        confidence=parsed.get("confidence", 0.5),
-                        agent_reasoning=final_answer
+                        agent_reasoning=final_answer,
+                        **verdict.model_dump()
                     )
-                except json.JSONDecodeError:
+                except (json.JSONDecodeError, ValidationError):
                     pass
             
             # Fallback parsing
@@ -244,12 +373,13 @@ Please validate this claim using the available tools and provide a comprehensive
     def _parse_text_result(self, claim_id: str, text: str) -> AgentResult:
         """Parse text result when JSON parsing fails"""
         # Simple text parsing logic
-        status = "Not Validated" if any(word in text.lower() for word in ["error", "invalid", "failed"]) else "Validated"
+        lowered = text.lower()
+        status = "Not Validated" if any(word in lowered for word in ["error", "invalid", "failed"]) else "Validated"
         error_type = "Technical"  # Default
         
-        if "medical" in text.lower():
+        if "medical" in lowered:
             error_type = "Medical"
-        elif "both" in text.lower() or ("technical" in text.lower() and "medical" in text.lower()):
+        elif "both" in lowered or ("technical" in lowered and "medical" in lowered):
             error_type = "Both"
         elif status == "Validated":
             error_type = "No error"
@@ -290,10 +420,44 @@ Please validate this claim using the available tools and provide a comprehensive
                 agent_reasoning=f"Complete validation failure: {str(e)}"
             )
     
-    def validate_claims_batch(self, claims: List[Master]) -> List[AgentResult]:
-        """Validate multiple claims in batch"""
-        results = []
+    async def avalidate_claims_batch(self, claims: List[Master], max_concurrency: int = AGENT_MAX_CONCURRENCY) -> List[AgentResult]:
+        """Validate claims concurrently, at most max_concurrency agent runs at a time"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # Read every claim's fields (which may refresh expired rows) before any tool thread touches the session;
+        # claims the deterministic checks settle never reach the agent
+        prepared = []
         for claim in claims:
-            result = self.validate_claim(claim)
-            results.append(result)
-        return results
\ No newline at end of file
+            verdict = self._fast_verdict(claim)
+            if verdict is None:
+                prepared.append((claim, verdict, self._cache_key(claim), self._agent_input(claim)))
+            else:
+                prepared.append((claim, verdict, None, None))
+        
+        # One agent run per uncached signature; the claim that starts it gets the full result
+        runs = {}
+        for claim, verdict, key, agent_input in prepared:
+            if verdict is None and key not in self._result_cache and key not in runs:
+                runs[key] = (claim, asyncio.ensure_future(self._ainvoke(agent_input, semaphore)))
+        await asyncio.gather(*(run for _, run in runs.values()), return_exceptions=True)
+        for key, (_, run) in runs.items():
+            if run.exception() is None:
+                self._result_cache[key] = run.result()
+        
+        results = []
+        for claim, verdict, key, _ in prepared:
+            owner, run = runs.get(key, (None, None))
+            if verdict is not None:
+                results.append(verdict)
+            elif run is not None and run.exception() is not None:
+                results.append(self._with_session(self._fallback_validation, claim, str(run.exception())))
+            elif owner is claim:
+                results.append(self._parse_agent_result(claim.claim_id, run.result()))
+            else:
+                results.append(self._cached_result(claim, key))
+        return results
+    
+    def validate_claims_batch(self, claims: List[Master], max_concurrency: int = AGENT_MAX_CONCURRENCY) -> List[AgentResult]:
+        """Validate multiple claims in batch, overlapping their LLM round-trips"""
+        if not claims:
+            return []
+        return asyncio.run(self.avalidate_claims_batch(claims, max_concurrency))
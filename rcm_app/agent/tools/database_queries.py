@@ -4,8 +4,13 @@ Database query tool for historical context
 
 from typing import Dict, Any, List
 from langchain.tools import BaseTool
+from sqlalchemy import func, or_
 from pydantic import BaseModel, Field
 from rcm_app.models.models import Master
+from rcm_app.utils.cache import BoundedDict
+
+# Current claims remembered per tool, oldest evicted first
+_CURRENT_CLAIMS_SIZE = 1024
 
 
 class DatabaseQueryInput(BaseModel):
@@ -26,6 +31,8 @@ class DatabaseQueryTool(BaseTool):
         super().__init__(**kwargs)
         # Store session as private attribute
         self._session = session
+        # (claim_id, tenant_id) -> (service_code, diagnosis_codes); a claim's codes do not change while it is validated
+        self._current_claims: BoundedDict = BoundedDict(_CURRENT_CLAIMS_SIZE)
     
     def _run(self, claim_id: str, tenant_id: str, query_type: str) -> str:
         """Query database for historical context"""
@@ -42,20 +49,32 @@ class DatabaseQueryTool(BaseTool):
         except Exception as e:
             return f"Database query error: {str(e)}"
     
+    def _get_current_claim(self, claim_id: str, tenant_id: str):
+        """Fetch the current claim's service and diagnosis codes once per claim; None if not found"""
+        key = (claim_id, tenant_id)
+        current_claim = self._current_claims.get(key)
+        if current_claim is None:
+            current_claim = self._session.query(Master.service_code, Master.diagnosis_codes).filter(
+                Master.claim_id == claim_id,
+                Master.tenant_id == tenant_id
+            ).first()
+            if current_claim is not None:
+                self._current_claims[key] = current_claim
+        return current_claim
+    
     def _get_similar_claims(self, claim_id: str, tenant_id: str) -> str:
         """Get similar claims for context"""
         try:
             # Get the current claim
-            current_claim = self._session.query(Master).filter(
-                Master.claim_id == claim_id,
-                Master.tenant_id == tenant_id
-            ).first()
+            current_claim = self._get_current_claim(claim_id, tenant_id)
             
             if not current_claim:
                 return "Claim not found"
             
-            # Get similar claims (same service code or diagnosis)
-            similar_claims = self._session.query(Master).filter(
+            # Similar claims share the service code; only the five reported rows are read
+            similar_claims = self._session.query(
+                Master.claim_id, Master.service_code, Master.error_type, Master.status, Master.paid_amount_aed
+            ).filter(
                 Master.tenant_id == tenant_id,
                 Master.claim_id != claim_id,
                 Master.service_code == current_claim.service_code
@@ -82,28 +101,25 @@ class DatabaseQueryTool(BaseTool):
     def _get_service_code_history(self, claim_id: str, tenant_id: str) -> str:
         """Get service code history"""
         try:
-            current_claim = self._session.query(Master).filter(
-                Master.claim_id == claim_id,
-                Master.tenant_id == tenant_id
-            ).first()
+            current_claim = self._get_current_claim(claim_id, tenant_id)
             
             if not current_claim:
                 return "Claim not found"
             
-            # Get all claims with same service code
-            service_claims = self._session.query(Master).filter(
+            # Count claims with the same service code per error type in SQL
+            error_rows = self._session.query(Master.error_type, func.count(Master.id)).filter(
                 Master.tenant_id == tenant_id,
                 Master.service_code == current_claim.service_code
-            ).all()
+            ).group_by(Master.error_type).all()
             
-            # Calculate statistics
-            total_claims = len(service_claims)
+            # Calculate statistics; a missing error type counts as "No error"
             error_counts = {}
-            for claim in service_claims:
-                error_type = claim.error_type or "No error"
-                error_counts[error_type] = error_counts.get(error_type, 0) + 1
+            for error_type, count in error_rows:
+                error_type = error_type or "No error"
+                error_counts[error_type] = error_counts.get(error_type, 0) + count
+            total_claims = sum(error_counts.values())
             
-            return f"Service code {current_claim.service_code} history: {total_claims} total claims, errors: {error_counts}"
+            return f"Service code {current_claim.service_code} history: {total_claims} total claims, errors: {dict(sorted(error_counts.items()))}"
             
         except Exception as e:
             return f"Error getting service code history: {str(e)}"
@@ -111,28 +127,20 @@ class DatabaseQueryTool(BaseTool):
     def _get_diagnosis_history(self, claim_id: str, tenant_id: str) -> str:
         """Get diagnosis code history"""
         try:
-            current_claim = self._session.query(Master).filter(
-                Master.claim_id == claim_id,
-                Master.tenant_id == tenant_id
-            ).first()
+            current_claim = self._get_current_claim(claim_id, tenant_id)
             
             if not current_claim:
                 return "Claim not found"
             
-            # Get claims with similar diagnosis codes
-            diagnosis_claims = []
+            # Count claims sharing any of the diagnosis codes in one query
+            matching_claims = 0
             if current_claim.diagnosis_codes:
-                for diagnosis in current_claim.diagnosis_codes:
-                    claims = self._session.query(Master).filter(
-                        Master.tenant_id == tenant_id,
-                        Master.diagnosis_codes.contains([diagnosis])
-                    ).all()
-                    diagnosis_claims.extend(claims)
-            
-            # Remove duplicates
-            unique_claims = list({c.claim_id: c for c in diagnosis_claims}.values())
+                matching_claims = self._session.query(func.count(func.distinct(Master.claim_id))).filter(
+                    Master.tenant_id == tenant_id,
+                    or_(*[Master.diagnosis_codes.contains([diagnosis]) for diagnosis in current_claim.diagnosis_codes])
+                ).scalar()
             
-            return f"Diagnosis history: {len(unique_claims)} claims with similar diagnosis codes"
+            return f"Diagnosis history: {matching_claims} claims with similar diagnosis codes"
             
         except Exception as e:
-            return f"Error getting diagnosis history: {str(e)}"
\ No newline at end of file
+            return f"Error getting diagnosis history: {str(e)}"
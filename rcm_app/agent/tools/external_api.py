@@ -2,12 +2,30 @@
 External API tool for mock verification calls
 """
 
+import asyncio
 from typing import Dict, Any
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 import re
 import time
-import random
+import zlib
+from rcm_app.utils.cache import BoundedDict
+
+# Approval numbers: two or more letters then three or more digits (matched upper-cased)
+_APPROVAL_RE = re.compile(r'^[A-Z]{2,}[0-9]{3,}$')
+_INVALID_APPROVALS = frozenset({"NA", "Obtain approval", ""})
+
+# Simulated round-trip of the mock verification APIs, in seconds
+_MOCK_API_LATENCY = 0.1
+
+# (api_type, value) -> response; the mocks are deterministic, so repeat calls skip the round-trip
+_RESPONSE_CACHE: BoundedDict = BoundedDict(4096)
+
+
+def _remember(key: tuple, response: str) -> str:
+    """Store a response; the oldest entry is evicted once the cache is full"""
+    _RESPONSE_CACHE[key] = response
+    return response
 
 
 class ExternalAPIInput(BaseModel):
@@ -23,33 +41,54 @@ class ExternalAPITool(BaseTool):
     description: str = "Make mock external API calls for verification (approval, member, facility)"
     args_schema: type = ExternalAPIInput
     
+    def _handler(self, api_type: str):
+        """Verification method for api_type, or None if unknown"""
+        return {
+            "approval_verification": self._verify_approval,
+            "member_verification": self._verify_member,
+            "facility_verification": self._verify_facility,
+        }.get(api_type)
+    
     def _run(self, approval_number: str, api_type: str) -> str:
         """Make mock external API call"""
         try:
-            if api_type == "approval_verification":
-                return self._verify_approval(approval_number)
-            elif api_type == "member_verification":
-                return self._verify_member(approval_number)
-            elif api_type == "facility_verification":
-                return self._verify_facility(approval_number)
-            else:
+            key = (api_type, approval_number)
+            if key in _RESPONSE_CACHE:
+                return _RESPONSE_CACHE[key]
+            handler = self._handler(api_type)
+            if handler is None:
+                return f"Unknown API type: {api_type}"
+            # Simulate API delay
+            time.sleep(_MOCK_API_LATENCY)
+            return _remember(key, handler(approval_number))
+                
+        except Exception as e:
+            return f"External API error: {str(e)}"
+    
+    async def _arun(self, approval_number: str, api_type: str) -> str:
+        """Async mock external API call; the simulated delay yields to other agent runs"""
+        try:
+            key = (api_type, approval_number)
+            if key in _RESPONSE_CACHE:
+                return _RESPONSE_CACHE[key]
+            handler = self._handler(api_type)
+            if handler is None:
                 return f"Unknown API type: {api_type}"
+            await asyncio.sleep(_MOCK_API_LATENCY)
+            return _remember(key, handler(approval_number))
                 
         except Exception as e:
             return f"External API error: {str(e)}"
     
     def _verify_approval(self, approval_number: str) -> str:
         """Mock approval verification API"""
-        # Simulate API delay
-        time.sleep(0.1)
-        
-        if not approval_number or approval_number in ["NA", "Obtain approval", ""]:
+        if not approval_number or approval_number in _INVALID_APPROVALS:
             return "API Response: Approval verification failed - No approval number provided"
         
         # Mock validation logic
         if self._is_valid_approval_format(approval_number):
-            # Simulate random success/failure for realistic testing
-            if random.random() > 0.1:  # 90% success rate
+            # Simulate success/failure deterministically: ~90% of approval numbers hash to success
+            if zlib.crc32(approval_number.encode()) % 10 != 0:
                 return f"API Response: Approval {approval_number} verified successfully"
             else:
                 return f"API Response: Approval {approval_number} verification failed - Not found in system"
@@ -58,8 +97,6 @@ class ExternalAPITool(BaseTool):
     
     def _verify_member(self, member_id: str) -> str:
         """Mock member verification API"""
-        time.sleep(0.1)
-        
         if not member_id:
             return "API Response: Member verification failed - No member ID provided"
         
@@ -71,8 +108,6 @@ class ExternalAPITool(BaseTool):
     
     def _verify_facility(self, facility_id: str) -> str:
         """Mock facility verification API"""
-        time.sleep(0.1)
-        
         if not facility_id:
             return "API Response: Facility verification failed - No facility ID provided"
         
@@ -87,5 +122,4 @@ class ExternalAPITool(BaseTool):
         if not approval_number:
             return False
         # Valid format: starts with letters, followed by numbers
-        pattern = re.compile(r'^[A-Z]{2,}[0-9]{3,}$')
-        return bool(pattern.match(approval_number.upper()))
\ No newline at end of file
+        return bool(_APPROVAL_RE.match(approval_number.upper()))
\ No newline at end of file
@@ -2,11 +2,16 @@
 LLM query tool for nuanced error explanations
 """
 
+import json
 from typing import Dict, Any
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
+from rcm_app.utils.cache import BoundedDict
 from rcm_app.utils.llm import GeminiClient
 
+# Cached analyses per tool; the tool is shared process-wide (see react_agent._shared_tools)
+_LLM_CACHE_SIZE = 1024
+
 
 class LLMQueryInput(BaseModel):
     """Input for LLM query"""
@@ -26,12 +31,19 @@ class LLMQueryTool(BaseTool):
         super().__init__(**kwargs)
         # Initialize LLM client as a private attribute
         self._llm_client = GeminiClient()
+        # Analyses per identical (claim_data, rules_text, query), oldest evicted first; failed queries are not cached
+        self._cache: BoundedDict = BoundedDict(_LLM_CACHE_SIZE)
     
     def _run(self, claim_data: Dict[str, Any], rules_text: str, query: str) -> str:
         """Query LLM for analysis"""
         try:
-            # Use enhanced analysis method
-            result = self._llm_client.enhanced_analysis(claim_data, rules_text, query)
+            # Use enhanced analysis method, once per distinct input
+            key = (json.dumps(claim_data, sort_keys=True, default=str), rules_text, query)
+            result = self._cache.get(key)
+            if result is None:
+                result = self._llm_client.enhanced_analysis(claim_data, rules_text, query)
+                if result:
+                    self._cache[key] = result
             
             if result:
                 return f"LLM Analysis: {result.get('analysis', 'No analysis available')}"
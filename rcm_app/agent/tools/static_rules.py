@@ -6,6 +6,8 @@ from typing import Dict, Any
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
+_INVALID_APPROVALS = frozenset({"NA", "Obtain approval", ""})
+_DIAGNOSES_REQUIRING_APPROVAL = frozenset({"E11.9", "R07.9", "Z34.0"})
 
 class StaticRulesInput(BaseModel):
     """Input for static rules validation"""
@@ -29,19 +31,19 @@ class StaticRulesTool(BaseTool):
         service_code = claim_data.get("service_code")
         approval_number = claim_data.get("approval_number")
         services_requiring_approval = rules.get("services_requiring_approval", [])
+        approval_missing = not approval_number or approval_number in _INVALID_APPROVALS
         
         if service_code in services_requiring_approval:
-            if not approval_number or approval_number in ["NA", "Obtain approval", ""]:
+            if approval_missing:
                 errors.append(f"Service code {service_code} requires approval")
                 error_types.add("Technical")
         
         # Check diagnosis code approval
         diagnosis_codes = claim_data.get("diagnosis_codes", [])
-        diagnoses_requiring_approval = ["E11.9", "R07.9", "Z34.0"]
         
         for diagnosis in diagnosis_codes:
-            if diagnosis in diagnoses_requiring_approval:
-                if not approval_number or approval_number in ["NA", "Obtain approval", ""]:
+            if diagnosis in _DIAGNOSES_REQUIRING_APPROVAL:
+                if approval_missing:
                     errors.append(f"Diagnosis code {diagnosis} requires approval")
                     error_types.add("Medical")
         
@@ -50,7 +52,7 @@ class StaticRulesTool(BaseTool):
         threshold = rules.get("paid_threshold_aed", 250)
         
         if paid_amount > threshold:
-            if not approval_number or approval_number in ["NA", "Obtain approval", ""]:
+            if approval_missing:
                 errors.append(f"Paid amount {paid_amount} exceeds threshold {threshold}")
                 error_types.add("Technical")
         
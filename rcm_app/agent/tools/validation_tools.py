@@ -3,13 +3,60 @@ Main validation tools orchestrator for the AI agent
 """
 
 import re
+from collections import Counter
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from sqlalchemy import literal, select, union_all
 from rcm_app.models.models import Master
 from rcm_app.rules.loader import RulesBundle
+from rcm_app.utils.cache import BoundedDict, for_bundle
+from rcm_app.utils.validators import Validator
 
+# Approval numbers: two or more letters then three or more digits (matched upper-cased)
+_APPROVAL_RE = re.compile(r'^[A-Z]{2,}[0-9]{3,}$')
+_INVALID_APPROVALS = frozenset({"NA", "Obtain approval", ""})
+_DIAGNOSES_REQUIRING_APPROVAL = frozenset({"E11.9", "R07.9", "Z34.0"})
 
-@dataclass
+# Error categories as bits (plain ints), combined with | and mapped back to labels by table lookup
+_TECHNICAL = 1
+_MEDICAL = 2
+_ERROR_TYPE_LABELS = ("No error", "Technical", "Medical", "Both")
+_ERROR_TYPE_BITS = {label: bits for bits, label in enumerate(_ERROR_TYPE_LABELS)}
+
+# ID fields that must be upper-case when the tenant's id_rules require it
+_ID_FIELDS = ("national_id", "member_id", "facility_id", "service_code")
+
+# Claim fields read by validate_claim_comprehensive
+_CLAIM_FIELDS = (
+    "national_id", "member_id", "facility_id", "unique_id",
+    "service_code", "diagnosis_codes", "paid_amount_aed", "approval_number",
+)
+
+# Rules bundle id -> (bundle, {claim field values -> ValidationResult}). Bundles are rebuilt
+# whenever a tenant's rules change on disk, so a new bundle starts with no results.
+_RESULT_CACHES: BoundedDict = BoundedDict(32)
+_RESULTS_PER_BUNDLE = 10000
+
+
+def _results_for(rules: RulesBundle) -> BoundedDict:
+    """Shared comprehensive-validation results for a rules bundle"""
+    return for_bundle(_RESULT_CACHES, rules, lambda _: BoundedDict(_RESULTS_PER_BUNDLE))
+
+
+def _paid_amount(value: Any) -> Optional[float]:
+    """A paid amount as a float (0.0 when missing), or None if it is not numeric"""
+    if value is None:
+        return 0.0
+    if isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
 class ValidationResult:
     """Result of validation with confidence score"""
     is_valid: bool
@@ -19,16 +66,25 @@ class ValidationResult:
     confidence: float
 
 
+# Shared by every check that finds nothing; its empty tuples keep it from being mutated
+_VALID_RESULT = ValidationResult(True, "No error", (), (), 1.0)
+
+
 class ValidationTools:
     """Main validation tools class that orchestrates all validation checks"""
     
     def __init__(self, rules: RulesBundle, session):
         self.rules = rules
         self.session = session
-        self.id_patterns = {
-            k: re.compile(v) for k, v in (rules.id_rules.get("patterns", {}) or {}).items()
-        }
+        # Compiled once per rules bundle and shared with the pipeline's Validator
+        self.id_patterns = Validator.for_rules(rules).id_patterns
         self.uppercase_required = bool(rules.id_rules.get("uppercase_required", True))
+        # Parsed once; None (a missing or non-numeric threshold) fails every claim's paid amount check
+        threshold = rules.paid_threshold_aed
+        self.paid_threshold = _paid_amount(threshold) if threshold is not None else None
+        # Every claim field validate_claim_comprehensive reads, including fields the ID patterns name
+        self._pattern_fields = tuple(field for field in self.id_patterns if field not in _CLAIM_FIELDS)
+        self._results = _results_for(rules)
     
     def check_id_format(self, claim: Master) -> ValidationResult:
         """Validate ID formats according to rules"""
@@ -38,11 +94,13 @@ class ValidationTools:
         
         # Check uppercase requirement
         if self.uppercase_required:
-            for field in ["national_id", "member_id", "facility_id", "service_code"]:
+            for field in _ID_FIELDS:
                 val = getattr(claim, field)
-                if val and val != val.upper():
-                    errors.append(f"{field} '{val}' must be uppercase")
-                    actions.append(f"Convert {field} to uppercase: {val.upper()}")
+                if val:
+                    upper = val.upper()
+                    if upper != val:
+                        errors.append(f"{field} '{val}' must be uppercase")
+                        actions.append(f"Convert {field} to uppercase: {upper}")
         
         # Check pattern matching
         for field, pattern in self.id_patterns.items():
@@ -68,13 +126,7 @@ class ValidationTools:
                 confidence=confidence
             )
         
-        return ValidationResult(
-            is_valid=True,
-            error_type="No error",
-            explanations=[],
-            recommended_actions=[],
-            confidence=1.0
-        )
+        return _VALID_RESULT
     
     def _validate_unique_id_format(self, claim: Master) -> Optional[str]:
         """Validate unique_id format: first4(national_id)-middle4(member_id)-last4(facility_id)"""
@@ -82,71 +134,66 @@ class ValidationTools:
             return "unique_id cannot be validated without national_id, member_id, and facility_id"
         
         expected = f"{claim.national_id[:4]}-{claim.member_id[:4]}-{claim.facility_id[:4]}"
-        if claim.unique_id != expected:
-            return f"unique_id '{claim.unique_id}' violates formatting rules: Expected '{expected}'"
+        uid = claim.unique_id
+        if uid != expected:
+            return f"unique_id '{uid}' violates formatting rules: Expected '{expected}'"
         return None
     
     def apply_static_rules(self, claim: Master) -> ValidationResult:
         """Apply static business rules for service codes, diagnosis codes, and paid amounts"""
         errors = []
         actions = []
-        error_types = set()
+        error_mask = 0
         confidence = 0.95
         
         # Check service code approval requirement
         if claim.service_code and claim.service_code in self.rules.services_requiring_approval:
-            if not claim.approval_number or claim.approval_number in ["NA", "Obtain approval", ""]:
+            if not claim.approval_number or claim.approval_number in _INVALID_APPROVALS:
                 errors.append(f"Service code {claim.service_code} requires approval, but approval_number is '{claim.approval_number}'")
                 actions.append(f"Obtain valid approval for service code {claim.service_code}")
-                error_types.add("Technical")
+                error_mask |= _TECHNICAL
         
-        # Check diagnosis code approval requirement
+        # Check diagnosis code approval requirement: one error naming every offending code
         if claim.diagnosis_codes:
-            for diagnosis in claim.diagnosis_codes:
-                if diagnosis in ["E11.9", "R07.9", "Z34.0"]:  # Diagnosis codes requiring approval
-                    if not claim.approval_number or claim.approval_number in ["NA", "Obtain approval", ""]:
-                        errors.append(f"Diagnosis code {diagnosis} requires approval, but approval_number is '{claim.approval_number}'")
-                        actions.append(f"Obtain valid approval for diagnosis code {diagnosis}")
-                        error_types.add("Medical")
+            if isinstance(claim.diagnosis_codes, (set, frozenset)):
+                flagged = sorted(_DIAGNOSES_REQUIRING_APPROVAL & claim.diagnosis_codes)
+            else:
+                flagged = list(dict.fromkeys(d for d in claim.diagnosis_codes if d in _DIAGNOSES_REQUIRING_APPROVAL))
+            if flagged and (not claim.approval_number or claim.approval_number in _INVALID_APPROVALS):
+                if len(flagged) == 1:
+                    errors.append(f"Diagnosis code {flagged[0]} requires approval, but approval_number is '{claim.approval_number}'")
+                    actions.append(f"Obtain valid approval for diagnosis code {flagged[0]}")
+                else:
+                    codes = ", ".join(flagged)
+                    errors.append(f"Diagnosis codes {codes} require approval, but approval_number is '{claim.approval_number}'")
+                    actions.append(f"Obtain valid approval for diagnosis codes {codes}")
+                error_mask |= _MEDICAL
         
         # Check paid amount threshold
-        try:
-            paid_amount = float(claim.paid_amount_aed) if claim.paid_amount_aed is not None else 0.0
-            threshold = float(self.rules.paid_threshold_aed)
-            
-            if paid_amount > threshold:
-                if not claim.approval_number or claim.approval_number in ["NA", "Obtain approval", ""]:
-                    errors.append(f"Paid amount {paid_amount} exceeds threshold {threshold}, requiring approval")
-                    actions.append(f"Obtain approval for high paid amount {paid_amount}")
-                    error_types.add("Technical")
-        except (ValueError, TypeError):
+        paid_amount = _paid_amount(claim.paid_amount_aed)
+        threshold = self.paid_threshold
+        if paid_amount is None or threshold is None:
             errors.append("Invalid paid_amount_aed value")
             actions.append("Correct paid_amount_aed format")
-            error_types.add("Technical")
+            error_mask |= _TECHNICAL
+        elif paid_amount > threshold:
+            if not claim.approval_number or claim.approval_number in _INVALID_APPROVALS:
+                errors.append(f"Paid amount {paid_amount} exceeds threshold {threshold}, requiring approval")
+                actions.append(f"Obtain approval for high paid amount {paid_amount}")
+                error_mask |= _TECHNICAL
         
         # Check approval number validity
-        if claim.approval_number and claim.approval_number not in ["NA", "Obtain approval", ""]:
+        if claim.approval_number and claim.approval_number not in _INVALID_APPROVALS:
             if not self._is_valid_approval_number(claim.approval_number):
                 errors.append(f"Invalid approval_number format: '{claim.approval_number}'")
                 actions.append("Provide valid approval number (e.g., APP001)")
-                error_types.add("Technical")
+                error_mask |= _TECHNICAL
         
         if not errors:
-            return ValidationResult(
-                is_valid=True,
-                error_type="No error",
-                explanations=[],
-                recommended_actions=[],
-                confidence=1.0
-            )
+            return _VALID_RESULT
         
         # Determine error type
-        if "Technical" in error_types and "Medical" in error_types:
-            error_type = "Both"
-        elif "Medical" in error_types:
-            error_type = "Medical"
-        else:
-            error_type = "Technical"
+        error_type = _ERROR_TYPE_LABELS[error_mask]
         
         return ValidationResult(
             is_valid=False,
@@ -160,37 +207,49 @@ class ValidationTools:
         """Check if approval number follows valid format (e.g., APP001)"""
         if not approval_number:
             return False
-        # Valid format: starts with letters, followed by numbers
-        pattern = re.compile(r'^[A-Z]{2,}[0-9]{3,}$')
-        return bool(pattern.match(approval_number.upper()))
+        # Valid format: starts with letters, followed by numbers; approval numbers are
+        # usually stored upper-cased already, so only upper-case after a miss
+        if _APPROVAL_RE.match(approval_number):
+            return True
+        upper = approval_number.upper()
+        return upper != approval_number and bool(_APPROVAL_RE.match(upper))
     
     def query_database(self, claim_id: str, tenant_id: str) -> Dict[str, Any]:
         """Query database for historical context"""
         try:
-            # Query for similar claims
-            similar_claims = self.session.query(Master).filter(
-                Master.tenant_id == tenant_id,
-                Master.claim_id != claim_id
-            ).limit(5).all()
-            
-            # Query for claims with same service code
-            service_claims = self.session.query(Master).filter(
-                Master.tenant_id == tenant_id,
-                Master.service_code == self.session.query(Master).filter(
+            # One UNION ALL statement returns the similar claims, the claims sharing the current
+            # claim's service code (via a scalar subquery) and the current claim itself
+            columns = (Master.claim_id, Master.service_code, Master.error_type, Master.status)
+            service_code = select(Master.service_code).where(Master.claim_id == claim_id).scalar_subquery()
+            parts = [
+                select(literal("similar").label("kind"), *columns).where(
+                    Master.tenant_id == tenant_id,
+                    Master.claim_id != claim_id
+                ).limit(5),
+                select(literal("service").label("kind"), *columns).where(
+                    Master.tenant_id == tenant_id,
+                    Master.service_code.is_not_distinct_from(service_code)
+                ).limit(3),
+                select(literal("current").label("kind"), *columns).where(
                     Master.claim_id == claim_id
-                ).first().service_code
-            ).limit(3).all()
+                ).limit(1),
+            ]
+            rows = self.session.execute(union_all(*(select(part.subquery()) for part in parts))).all()
+            
+            kinds = Counter(row.kind for row in rows)
+            if not kinds["current"]:
+                return {"error": f"Claim {claim_id} not found", "historical_data": []}
             
             return {
-                "similar_claims_count": len(similar_claims),
-                "service_code_claims_count": len(service_claims),
+                "similar_claims_count": kinds["similar"],
+                "service_code_claims_count": kinds["service"],
                 "historical_data": [
                     {
                         "claim_id": c.claim_id,
                         "service_code": c.service_code,
                         "error_type": c.error_type,
                         "status": c.status
-                    } for c in similar_claims[:3]
+                    } for c in islice((row for row in rows if row.kind == "similar"), 3)
                 ]
             }
         except Exception as e:
@@ -198,7 +257,7 @@ class ValidationTools:
     
     def mock_external_api(self, approval_number: str) -> Dict[str, Any]:
         """Mock external API call for approval verification"""
-        if not approval_number or approval_number in ["NA", "Obtain approval", ""]:
+        if not approval_number or approval_number in _INVALID_APPROVALS:
             return {"valid": False, "reason": "No approval number provided"}
         
         # Mock validation logic
@@ -207,34 +266,67 @@ class ValidationTools:
         else:
             return {"valid": False, "reason": "Invalid approval number format"}
     
+    def _result_key(self, claim: Master) -> Optional[tuple]:
+        """Values of the claim fields the validation reads, or None if they are not hashable"""
+        values = [getattr(claim, field) for field in _CLAIM_FIELDS]
+        values.extend(getattr(claim, field, None) for field in self._pattern_fields)
+        # diagnosis_codes arrives as a list
+        key = tuple(tuple(value) if isinstance(value, list) else value for value in values)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
     def validate_claim_comprehensive(self, claim: Master) -> ValidationResult:
-        """Comprehensive validation combining all checks"""
+        """Comprehensive validation combining all checks
+        
+        Results are shared by every claim with the same field values under the
+        same rules bundle, so re-validated claims skip the checks.
+        """
+        key = self._result_key(claim)
+        result = self._results.get(key) if key is not None else None
+        if result is None:
+            result = self._validate_claim(claim)
+            if key is not None:
+                self._results[key] = result
+        if result is _VALID_RESULT:
+            return result
+        # Callers own the returned lists
+        return ValidationResult(
+            is_valid=result.is_valid,
+            error_type=result.error_type,
+            explanations=list(result.explanations),
+            recommended_actions=list(result.recommended_actions),
+            confidence=result.confidence
+        )
+    
+    def _validate_claim(self, claim: Master) -> ValidationResult:
+        """Run the ID format checks and static rules on a claim and combine their results"""
         # Step 1: Check ID formats
         id_result = self.check_id_format(claim)
         
         # Step 2: Apply static rules
         rules_result = self.apply_static_rules(claim)
         
+        # A valid side contributes nothing, so the other result is already the combination
+        if id_result.is_valid:
+            return rules_result
+        if rules_result.is_valid:
+            return id_result
+        
         # Combine results
         all_errors = id_result.explanations + rules_result.explanations
         all_actions = id_result.recommended_actions + rules_result.recommended_actions
         
         # Determine overall error type
-        error_types = set()
+        error_mask = 0
         if not id_result.is_valid:
-            error_types.add(id_result.error_type)
+            error_mask |= _ERROR_TYPE_BITS[id_result.error_type]
         if not rules_result.is_valid:
-            error_types.add(rules_result.error_type)
-        
-        if not error_types:
-            final_error_type = "No error"
-            is_valid = True
-        elif "Both" in error_types or (len(error_types) > 1):
-            final_error_type = "Both"
-            is_valid = False
-        else:
-            final_error_type = list(error_types)[0]
-            is_valid = False
+            error_mask |= _ERROR_TYPE_BITS[rules_result.error_type]
+        final_error_type = _ERROR_TYPE_LABELS[error_mask]
+        is_valid = not error_mask
         
         # Calculate overall confidence
         confidence = min(id_result.confidence, rules_result.confidence) if all_errors else 1.0
@@ -1,21 +1,87 @@
-from io import BytesIO
-from flask import Blueprint, jsonify, request
+import os
+import re
+import tempfile
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from types import MappingProxyType
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt
 import pandas as pd
 from rcm_app.pipeline.engine import ValidationEngine
+from rcm_app.pipeline.jobs import get_job, submit_job
 from rcm_app.rules.loader import TenantConfigLoader
+from rcm_app.utils.cache import BoundedDict
 from rcm_app.extensions import db
 from rcm_app.models.models import Master, Metrics, Audit
 from rcm_app.agent import RCMValidationAgent
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select, tuple_
 
 
 claims_bp = Blueprint("claims", __name__)
 
+# Shared by every request; bundles are cached per tenant until their rule files change, which is
+# checked at most every RULES_CHECK_SECONDS (POST /api/admin/reload_rules forces a reload)
+_TENANT_LOADER = TenantConfigLoader(check_interval=float(os.getenv("RULES_CHECK_SECONDS", "5")))
+
+# Upper bound on claim_ids accepted by one /validate request
+_MAX_VALIDATE_CLAIM_IDS = 10000
+
+# Largest page served from a fully materialized result; /results streams larger pages in
+# batches of _STREAM_BATCH_ROWS, other listings reject them
+_MAX_PAGE_SIZE = 1000
+_STREAM_BATCH_ROWS = 500
+
+# Uploaded column name aliases -> canonical claim columns (read-only, shared by every upload)
+_COLUMN_ALIASES = MappingProxyType({
+    "claimid": "claim_id",
+    "id": "claim_id",
+    "uniqueid": "unique_id",
+    "uid": "unique_id",
+    "diagnosis": "diagnosis_codes",
+    "diagnoses": "diagnosis_codes",
+    "paid_amount": "paid_amount_aed",
+    "approval": "approval_number",
+    "approvalno": "approval_number",
+})
+
+# CSV delimiter detection: candidates in tie-break order, and how much of the file is sampled
+_DELIMITERS = (",", ";", "\t", "|")
+_SNIFF_BYTES = 64 * 1024
+_QUOTED_RE = re.compile(r'"[^"]*"')
+
+# Lower-cased status / error type values recognised by _severity
+_INVALID_STATUSES = frozenset({"invalid", "not validated"})
+_VALID_STATUSES = frozenset({"valid", "validated"})
+_SINGLE_ERROR_TYPES = frozenset({"medical error", "technical error"})
+_NO_ERROR_TYPES = frozenset({"", "none", "no error"})
+
+# Tenant id -> (expires_at, chart data) for /results; the oldest tenant is dropped once full.
+# Runs that write metrics invalidate their tenant, so expiry only bounds staleness from other workers
+_CHART_CACHE: BoundedDict = BoundedDict(1024)
+_CHART_TTL_SECONDS = float(os.getenv("CHART_CACHE_SECONDS", "30"))
+
+# Arrow's multithreaded CSV reader parses whole-file uploads when installed and there are cores
+# to spread it over; on a single core the C engine is faster
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = "pyarrow" if (os.cpu_count() or 1) > 1 else "c"
+except Exception:  # noqa: BLE001
+    _CSV_ENGINE = "c"
+
+# Rust-based calamine reads spreadsheets when installed; pandas' default engine otherwise
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except Exception:  # noqa: BLE001
+    _EXCEL_ENGINE = None
+
 
 @claims_bp.post("/upload")
 @jwt_required()
 def upload_claims():
+    if _upload_too_large():
+        return jsonify({"message": "file too large"}), 413
     jwt_claims = get_jwt()
     tenant_id = (request.form.get("tenant_id") or jwt_claims.get("tenant_id") or "").strip()
     if not tenant_id:
@@ -26,91 +92,70 @@ def upload_claims():
         return jsonify({"message": "file is required"}), 400
 
     filename = (file.filename or "").lower()
+    if not filename.endswith((".csv", ".xlsx", ".xls")):
+        return jsonify({"message": "unsupported file type"}), 415
+    chunk_rows = current_app.config.get("UPLOAD_CHUNK_ROWS", 10000)
+
+    if _wants_background():
+        # Spool the upload to disk and ingest it on the job pool; clients poll /api/jobs/<job_id>
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                file.save(fh)
+            job_id = submit_job(
+                current_app._get_current_object(), _job_owner(), _ingest_upload_file, path, filename, tenant_id, chunk_rows
+            )
+        except Exception:
+            # The job deletes the spooled file once it runs; until it is queued it is ours to clean up
+            os.remove(path)
+            raise
+        return jsonify({"job_id": job_id, "status": "queued"}), 202
+
     try:
-        content = file.read()
-        buf = BytesIO(content)
-        if filename.endswith(".csv"):
-            # Robust CSV parsing: try common delimiters and encodings
-            parse_attempts = [
-                {"sep": ",", "encoding": None},
-                {"sep": ";", "encoding": None},
-                {"sep": "\t", "encoding": None},
-            ]
-            last_exc = None
-            df = None
-            for attempt in parse_attempts:
-                try:
-                    buf.seek(0)
-                    df = pd.read_csv(
-                        buf,
-                        dtype=str,
-                        keep_default_na=False,
-                        na_filter=False,
-                        sep=attempt["sep"],
-                    )
-                    break
-                except Exception as e:  # noqa: BLE001
-                    last_exc = e
-            if df is None:
-                raise last_exc or Exception("could not parse CSV")
-        elif filename.endswith(".xlsx") or filename.endswith(".xls"):
-            df = pd.read_excel(buf, dtype=str)
-        else:
-            return jsonify({"message": "unsupported file type"}), 415
+        chunks = _parse_upload(file.stream, filename, chunk_rows)
     except Exception as exc:  # noqa: BLE001
         return jsonify({"message": f"failed to parse file: {exc}"}), 400
 
-    # Normalize column names (trim, lower)
-    df.columns = [str(c).strip().lower() for c in df.columns]
-    # Map common aliases to required columns
-    col_aliases = {
-        "claimid": "claim_id",
-        "id": "claim_id",
-        "uniqueid": "unique_id",
-        "uid": "unique_id",
-        "diagnosis": "diagnosis_codes",
-        "diagnoses": "diagnosis_codes",
-        "paid_amount": "paid_amount_aed",
-        "paid_amount_aed": "paid_amount_aed",
-        "approval": "approval_number",
-        "approvalno": "approval_number",
-    }
-    df.rename(columns={k: v for k, v in col_aliases.items() if k in df.columns}, inplace=True)
-    # Align identifiers as in upload: mirror whichever exists
-    if "claim_id" not in df.columns and "unique_id" in df.columns:
-        df["claim_id"] = df["unique_id"].astype(str)
-    if "unique_id" not in df.columns and "claim_id" in df.columns:
-        df["unique_id"] = df["claim_id"].astype(str)
-    # Align identifiers: if only one of claim_id/unique_id is provided, mirror it
-    if "claim_id" not in df.columns and "unique_id" in df.columns:
-        df["claim_id"] = df["unique_id"].astype(str)
-    if "unique_id" not in df.columns and "claim_id" in df.columns:
-        df["unique_id"] = df["claim_id"].astype(str)
-
-    tenant_loader = TenantConfigLoader()
-    rules_bundle = tenant_loader.load_rules_for_tenant(tenant_id)
+    rules_bundle = _TENANT_LOADER.load_rules_for_tenant(tenant_id)
     engine = ValidationEngine(db.session, tenant_id, rules_bundle)
     try:
-        summary = engine.ingest_and_validate_dataframe(df)
+        summary = engine.ingest_and_validate_chunks(_normalize_columns(df) for df in chunks)
         return jsonify(summary), 200
     except ValueError as ve:
         return jsonify({"message": str(ve)}), 400
     except Exception as exc:  # noqa: BLE001
         return jsonify({"message": f"processing error: {exc}"}), 500
+    finally:
+        _invalidate_chart_data(tenant_id)
+
+
+@claims_bp.get("/jobs/<job_id>")
+@jwt_required()
+def job_status(job_id: str):
+    """Status of a background upload; result holds the ingestion summary once finished"""
+    job = get_job(job_id)
+    if job is None or job["owner"] != _job_owner():
+        return jsonify({"message": "job not found"}), 404
+    return jsonify(job), 200
 
 
 @claims_bp.post("/validate")
 @jwt_required()
 def validate_claims():
     jwt_claims = get_jwt()
-    tenant_id = (request.json or {}).get("tenant_id") or jwt_claims.get("tenant_id")
-    claim_ids = (request.json or {}).get("claim_ids") or []
+    body = _json_body()
+    tenant_id = body.get("tenant_id") or jwt_claims.get("tenant_id")
+    claim_ids = body.get("claim_ids") or []
     if not tenant_id or not claim_ids:
         return jsonify({"message": "tenant_id and claim_ids required"}), 400
-    tenant_loader = TenantConfigLoader()
-    rules_bundle = tenant_loader.load_rules_for_tenant(tenant_id)
+    if not isinstance(claim_ids, list) or not all(isinstance(c, (str, int)) for c in claim_ids):
+        return jsonify({"message": "claim_ids must be a list of claim ids"}), 400
+    if len(claim_ids) > _MAX_VALIDATE_CLAIM_IDS:
+        return jsonify({"message": f"at most {_MAX_VALIDATE_CLAIM_IDS} claim_ids per request"}), 400
+    rules_bundle = _TENANT_LOADER.load_rules_for_tenant(tenant_id)
     engine = ValidationEngine(db.session, tenant_id, rules_bundle)
     result = engine.validate_specific_claims(claim_ids)
+    _invalidate_chart_data(tenant_id)
     return jsonify(result), 200
 
 
@@ -122,67 +167,77 @@ def get_results():
     if not tenant_id:
         return jsonify({"message": "tenant_id required"}), 400
     
-    # Pagination parameters
+    # Pagination parameters; a cursor from a previous page replaces the page offset
     page = int(request.args.get("page", 1))
     page_size = int(request.args.get("page_size", 10))
+    try:
+        cursor = _decode_cursor(request.args.get("cursor"))
+    except ValueError:
+        return jsonify({"message": "invalid cursor"}), 400
     
     # Filter parameters
     status = request.args.get("status")
     error_type = request.args.get("error_type")
     service_code = request.args.get("service_code")
     
-    # Build query
-    q = Master.query.filter_by(tenant_id=tenant_id)
-    
+    # Build query over plain columns; rows are serialized directly without hydrating Master objects
+    filters = [Master.tenant_id == tenant_id]
     if status:
-        q = q.filter(Master.status == status)
+        filters.append(Master.status == status)
     if error_type:
-        q = q.filter(Master.error_type == error_type)
+        filters.append(Master.error_type == error_type)
     if service_code:
-        q = q.filter(Master.service_code == service_code)
+        filters.append(Master.service_code == service_code)
     
     # Get total count for pagination
-    total_claims = q.count()
+    total_claims = db.session.execute(select(func.count(Master.id)).where(*filters)).scalar()
     total_pages = (total_claims + page_size - 1) // page_size
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    claims = q.order_by(desc(Master.created_at)).offset(offset).limit(page_size).all()
-    
-    # Convert claims to dict with all Master Table fields
-    claims_data = []
-    for claim in claims:
-        claim_dict = {
-            "claim_id": claim.claim_id,
-            "encounter_type": claim.encounter_type,
-            "service_date": claim.service_date.isoformat() if claim.service_date else None,
-            "national_id": claim.national_id,
-            "member_id": claim.member_id,
-            "facility_id": claim.facility_id,
-            "unique_id": claim.unique_id,
-            "diagnosis_codes": claim.diagnosis_codes,
-            "service_code": claim.service_code,
-            "paid_amount_aed": float(claim.paid_amount_aed) if claim.paid_amount_aed is not None else None,
-            "approval_number": claim.approval_number,
-            "status": claim.status,
-            "error_type": claim.error_type,
-            "error_explanation": claim.error_explanation or [],
-            "recommended_action": claim.recommended_action or [],
-            "tenant_id": claim.tenant_id,
-            "created_at": claim.created_at.isoformat() if claim.created_at else None,
-            "updated_at": claim.updated_at.isoformat() if claim.updated_at else None
-        }
-        claims_data.append(claim_dict)
+    # Apply pagination: newest first, id breaking ties so cursors resume exactly
+    stmt = (
+        select(
+            Master.claim_id, Master.encounter_type, Master.service_date, Master.national_id,
+            Master.member_id, Master.facility_id, Master.diagnosis_codes, Master.service_code,
+            Master.paid_amount_aed, Master.approval_number, Master.status, Master.error_type,
+            Master.error_explanation, Master.recommended_action, Master.tenant_id,
+            Master.created_at, Master.updated_at, Master.id,
+        )
+        .where(*filters)
+        .order_by(desc(Master.created_at), desc(Master.id))
+        .limit(page_size)
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(Master.created_at, Master.id) < cursor)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
     
     # Get chart data from Metrics table
     chart_data = _get_chart_data(tenant_id)
     
+    if page_size > _MAX_PAGE_SIZE:
+        pagination = {
+            "page": page,
+            "total_pages": total_pages,
+            "total_claims": total_claims,
+            "page_size": page_size,
+        }
+        return Response(
+            stream_with_context(_stream_results(stmt, chart_data, pagination)),
+            mimetype=current_app.json.mimetype,
+        )
+    
+    claims = db.session.execute(stmt).all()
+    
+    # Convert claims to dict with all Master Table fields
+    claims_data = [_claim_dict(claim) for claim in claims]
+    
     # Pagination metadata
     pagination = {
         "page": page,
         "total_pages": total_pages,
         "total_claims": total_claims,
-        "page_size": page_size
+        "page_size": page_size,
+        "next_cursor": _next_cursor(claims, page_size)
     }
     
     return jsonify({
@@ -200,34 +255,50 @@ def audit_log():
     if not tenant_id:
         return jsonify({"message": "tenant_id required"}), 400
     
-    # Pagination parameters
+    # Pagination parameters; a cursor from a previous page replaces the page offset
     page = int(request.args.get("page", 1))
     page_size = int(request.args.get("page_size", 20))
+    if page_size > _MAX_PAGE_SIZE:
+        return jsonify({"message": f"page_size must be at most {_MAX_PAGE_SIZE}"}), 400
+    try:
+        cursor = _decode_cursor(request.args.get("cursor"))
+    except ValueError:
+        return jsonify({"message": "invalid cursor"}), 400
     
     # Filter parameters
     claim_id = request.args.get("claim_id")
     action = request.args.get("action")
     
-    # Build query
-    q = Audit.query.filter_by(tenant_id=tenant_id)
-    
+    # Build query over plain columns; rows are serialized directly without hydrating Audit objects
+    filters = [Audit.tenant_id == tenant_id]
     if claim_id:
-        q = q.filter(Audit.claim_id == claim_id)
+        filters.append(Audit.claim_id == claim_id)
     if action:
-        q = q.filter(Audit.action == action)
+        filters.append(Audit.action == action)
     
     # Get total count for pagination
-    total_audits = q.count()
+    total_audits = db.session.execute(select(func.count(Audit.id)).where(*filters)).scalar()
     total_pages = (total_audits + page_size - 1) // page_size
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    audits = q.order_by(desc(Audit.timestamp)).offset(offset).limit(page_size).all()
+    # Apply pagination: newest first, id breaking ties so cursors resume exactly
+    stmt = (
+        select(
+            Audit.id, Audit.claim_id, Audit.action, Audit.timestamp, Audit.outcome,
+            Audit.details, Audit.tenant_id, Audit.created_at,
+        )
+        .where(*filters)
+        .order_by(desc(Audit.timestamp), desc(Audit.id))
+        .limit(page_size)
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(Audit.timestamp, Audit.id) < cursor)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    audits = db.session.execute(stmt).all()
     
     # Convert audits to dict
-    audit_data = []
-    for audit in audits:
-        audit_dict = {
+    audit_data = [
+        {
             "id": audit.id,
             "claim_id": audit.claim_id,
             "action": audit.action,
@@ -237,14 +308,16 @@ def audit_log():
             "tenant_id": audit.tenant_id,
             "created_at": audit.created_at.isoformat() if audit.created_at else None
         }
-        audit_data.append(audit_dict)
+        for audit in audits
+    ]
     
     # Pagination metadata
     pagination = {
         "page": page,
         "total_pages": total_pages,
         "total_audits": total_audits,
-        "page_size": page_size
+        "page_size": page_size,
+        "next_cursor": _next_cursor(audits, page_size, "timestamp")
     }
     
     return jsonify({
@@ -253,10 +326,23 @@ def audit_log():
     }), 200
 
 
+@claims_bp.post("/admin/reload_rules")
+@jwt_required()
+def reload_rules():
+    """Drop cached rule bundles so the next request re-reads the tenant's rule files"""
+    jwt_claims = get_jwt()
+    if "admin" not in (jwt_claims.get("roles") or []):
+        return jsonify({"message": "admin role required"}), 403
+    tenant_id = _json_body().get("tenant_id")
+    return jsonify({"cleared": _TENANT_LOADER.clear_cache(tenant_id)}), 200
+
+
 @claims_bp.post("/adjudicate")
 @jwt_required()
 def adjudicate_claims():
     """Comprehensive medical claims adjudication with detailed validation and corrections"""
+    if _upload_too_large():
+        return jsonify({"message": "file too large"}), 413
     jwt_claims = get_jwt()
     tenant_id = (request.form.get("tenant_id") or jwt_claims.get("tenant_id") or "").strip()
     if not tenant_id:
@@ -268,60 +354,20 @@ def adjudicate_claims():
 
     filename = (file.filename or "").lower()
     try:
-        content = file.read()
-        buf = BytesIO(content)
+        # Parse straight from the upload stream rather than a second in-memory copy
         if filename.endswith(".csv"):
-            parse_attempts = [
-                {"sep": ","},
-                {"sep": ";"},
-                {"sep": "\t"},
-            ]
-            last_exc = None
-            df = None
-            for attempt in parse_attempts:
-                try:
-                    buf.seek(0)
-                    df = pd.read_csv(
-                        buf,
-                        dtype=str,
-                        keep_default_na=False,
-                        na_filter=False,
-                        sep=attempt["sep"],
-                    )
-                    break
-                except Exception as e:  # noqa: BLE001
-                    last_exc = e
-            if df is None:
-                raise last_exc or Exception("could not parse CSV")
+            df = _read_csv(file.stream)
         elif filename.endswith(".xlsx") or filename.endswith(".xls"):
-            df = pd.read_excel(buf, dtype=str)
+            df = pd.read_excel(file.stream, dtype=str, engine=_EXCEL_ENGINE)
         else:
             return jsonify({"message": "unsupported file type"}), 415
     except Exception as exc:  # noqa: BLE001
         return jsonify({"message": f"failed to parse file: {exc}"}), 400
 
     # Normalize column names and aliases for adjudication
-    df.columns = [str(c).strip().lower() for c in df.columns]
-    col_aliases = {
-        "claimid": "claim_id",
-        "id": "claim_id",
-        "uniqueid": "unique_id",
-        "uid": "unique_id",
-        "diagnosis": "diagnosis_codes",
-        "diagnoses": "diagnosis_codes",
-        "paid_amount": "paid_amount_aed",
-        "paid_amount_aed": "paid_amount_aed",
-        "approval": "approval_number",
-        "approvalno": "approval_number",
-    }
-    df.rename(columns={k: v for k, v in col_aliases.items() if k in df.columns}, inplace=True)
-    if "claim_id" not in df.columns and "unique_id" in df.columns:
-        df["claim_id"] = df["unique_id"].astype(str)
-    if "unique_id" not in df.columns and "claim_id" in df.columns:
-        df["unique_id"] = df["claim_id"].astype(str)
+    df = _normalize_columns(df)
 
-    tenant_loader = TenantConfigLoader()
-    rules_bundle = tenant_loader.load_rules_for_tenant(tenant_id)
+    rules_bundle = _TENANT_LOADER.load_rules_for_tenant(tenant_id)
     engine = ValidationEngine(db.session, tenant_id, rules_bundle)
     
     try:
@@ -332,6 +378,8 @@ def adjudicate_claims():
         return jsonify({"message": str(ve)}), 400
     except Exception as exc:  # noqa: BLE001
         return jsonify({"message": f"processing error: {exc}"}), 500
+    finally:
+        _invalidate_chart_data(tenant_id)
 
 
 @claims_bp.post("/agent")
@@ -339,9 +387,10 @@ def adjudicate_claims():
 def query_agent():
     """Query the AI agent for specific analysis"""
     jwt_claims = get_jwt()
-    tenant_id = (request.json or {}).get("tenant_id") or jwt_claims.get("tenant_id")
-    claim_id = (request.json or {}).get("claim_id")
-    query = (request.json or {}).get("query", "")
+    body = _json_body()
+    tenant_id = body.get("tenant_id") or jwt_claims.get("tenant_id")
+    claim_id = body.get("claim_id")
+    query = body.get("query", "")
     
     if not tenant_id or not claim_id:
         return jsonify({"message": "tenant_id and claim_id required"}), 400
@@ -357,21 +406,6 @@ def query_agent():
         recs_list = claim.recommended_action or []
         error_count = len(errors_list)
 
-        def _severity(status: str | None, error_type: str | None, count: int) -> str:
-            s = (status or "").lower()
-            e = (error_type or "").lower()
-            if s in {"invalid", "not validated"}:
-                if e == "both" or count >= 3:
-                    return "High"
-                if e in {"medical error", "technical error"} or count == 2:
-                    return "Medium"
-                return "Low"
-            if s in {"valid", "validated"}:
-                if e in {"", "none", "no error", None} and count == 0:
-                    return "None"
-                return "Low"
-            return "Medium"
-
         sev = _severity(claim.status, claim.error_type, error_count)
 
         headline = []
@@ -445,37 +479,256 @@ def query_agent():
         return jsonify({"message": f"Agent query failed: {str(e)}"}), 500
 
 
+def _severity(status: str | None, error_type: str | None, count: int) -> str:
+    """Severity label for a claim from its status, error type and number of issues"""
+    s = (status or "").lower()
+    e = (error_type or "").lower()
+    if s in _INVALID_STATUSES:
+        if e == "both" or count >= 3:
+            return "High"
+        if e in _SINGLE_ERROR_TYPES or count == 2:
+            return "Medium"
+        return "Low"
+    if s in _VALID_STATUSES:
+        if e in _NO_ERROR_TYPES and count == 0:
+            return "None"
+        return "Low"
+    return "Medium"
+
+
+def _upload_too_large() -> bool:
+    """Whether the declared request size exceeds MAX_CONTENT_LENGTH, checked before the body is read"""
+    max_bytes = current_app.config.get("MAX_CONTENT_LENGTH")
+    return bool(max_bytes and request.content_length and request.content_length > max_bytes)
+
+
+def _decode_cursor(value: str | None) -> tuple[datetime, int] | None:
+    """(sort timestamp, id) from a pagination cursor, or None when absent; ValueError if malformed"""
+    if not value:
+        return None
+    # Bad base64, bad UTF-8 and a bad split all raise ValueError subclasses
+    timestamp, row_id = urlsafe_b64decode(value.encode()).decode().split("|")
+    return datetime.fromisoformat(timestamp), int(row_id)
+
+
+def _next_cursor(rows, page_size: int, timestamp_field: str = "created_at") -> str | None:
+    """Cursor resuming after the last row of a full page; None once the listing is exhausted"""
+    if not rows or len(rows) < page_size:
+        return None
+    return _cursor_after(rows[-1], timestamp_field)
+
+
+def _cursor_after(row, timestamp_field: str = "created_at") -> str:
+    return urlsafe_b64encode(f"{getattr(row, timestamp_field).isoformat()}|{row.id}".encode()).decode()
+
+
+def _claim_dict(claim) -> dict:
+    """/results representation of a claims_master row"""
+    return {
+        "claim_id": claim.claim_id,
+        "encounter_type": claim.encounter_type,
+        "service_date": claim.service_date.isoformat() if claim.service_date else None,
+        "national_id": claim.national_id,
+        "member_id": claim.member_id,
+        "facility_id": claim.facility_id,
+        # unique_id is the same identifier as claim_id, see Master.unique_id
+        "unique_id": claim.claim_id,
+        "diagnosis_codes": claim.diagnosis_codes,
+        "service_code": claim.service_code,
+        "paid_amount_aed": float(claim.paid_amount_aed) if claim.paid_amount_aed is not None else None,
+        "approval_number": claim.approval_number,
+        "status": claim.status,
+        "error_type": claim.error_type,
+        "error_explanation": claim.error_explanation or [],
+        "recommended_action": claim.recommended_action or [],
+        "tenant_id": claim.tenant_id,
+        "created_at": claim.created_at.isoformat() if claim.created_at else None,
+        "updated_at": claim.updated_at.isoformat() if claim.updated_at else None
+    }
+
+
+def _stream_results(stmt, chart_data: dict, pagination: dict):
+    """/results body for a large page, encoded as rows are fetched _STREAM_BATCH_ROWS at a time.
+
+    Produces the same document as the jsonify path: keys in sorted order, with
+    next_cursor added to pagination once the last row is known.
+    """
+    dumps = current_app.json.dumps
+    yield '{"chart_data":' + dumps(chart_data, separators=(",", ":")) + ',"claims":['
+    count, last = 0, None
+    result = db.session.execute(stmt.execution_options(yield_per=_STREAM_BATCH_ROWS))
+    try:
+        for batch in result.partitions():
+            parts = [dumps(_claim_dict(claim), separators=(",", ":")) for claim in batch]
+            yield ("," if count else "") + ",".join(parts)
+            count += len(batch)
+            last = batch[-1]
+    finally:
+        result.close()
+    pagination["next_cursor"] = _cursor_after(last) if count == pagination["page_size"] else None
+    yield '],"pagination":' + dumps(pagination, separators=(",", ":")) + "}\n"
+
+
+def _json_body() -> dict:
+    """Parsed JSON object from the request, or {} when the body is missing or not an object"""
+    body = request.get_json(silent=True)
+    return body if isinstance(body, dict) else {}
+
+
+def _detect_delimiter(head: bytes) -> str:
+    """Delimiter of a CSV file, judged from its first bytes.
+
+    Each candidate is counted per line outside double quotes; the one whose
+    header count recurs on the most lines wins, then the one splitting the
+    header into more fields, then the earlier candidate. Defaults to ",".
+    """
+    lines = head.decode("utf-8", errors="ignore").splitlines()
+    if len(head) >= _SNIFF_BYTES and len(lines) > 1:
+        # The last line may be cut off mid-row
+        lines.pop()
+    lines = [_QUOTED_RE.sub("", line) for line in lines if line.strip()]
+    best, best_score = ",", None
+    for sep in _DELIMITERS:
+        counts = [line.count(sep) for line in lines]
+        if not counts or not counts[0]:
+            continue
+        score = (sum(count == counts[0] for count in counts), counts[0])
+        if best_score is None or score > best_score:
+            best, best_score = sep, score
+    return best
+
+
+def _job_owner() -> str:
+    """Owner recorded on the caller's background jobs: their JWT tenant, or the caller when the token has none.
+
+    Taken from the token rather than the request so the tenant_id form override
+    does not hide a job from the caller who submitted it.
+    """
+    jwt_claims = get_jwt()
+    return jwt_claims.get("tenant_id") or f"user:{jwt_claims.get('sub')}"
+
+
+def _wants_background() -> bool:
+    """Whether the client asked for the upload to be ingested as a background job"""
+    flag = request.args.get("async") or request.form.get("async") or ""
+    return flag.strip().lower() in ("1", "true", "yes")
+
+
+def _parse_upload(stream, filename: str, chunk_rows: int):
+    """DataFrame chunks of an uploaded CSV (streamed) or Excel (one chunk) file"""
+    if filename.endswith(".csv"):
+        # Parse the upload stream in chunks instead of buffering the whole file
+        return _read_csv_chunks(stream, chunk_rows)
+    return [pd.read_excel(stream, dtype=str, engine=_EXCEL_ENGINE)]
+
+
+def _ingest_upload_file(path: str, filename: str, tenant_id: str, chunk_rows: int) -> dict:
+    """Background job body: ingest and validate a spooled upload, then delete it"""
+    try:
+        with open(path, "rb") as fh:
+            try:
+                chunks = _parse_upload(fh, filename, chunk_rows)
+            except Exception as exc:  # noqa: BLE001
+                raise ValueError(f"failed to parse file: {exc}") from exc
+            rules_bundle = _TENANT_LOADER.load_rules_for_tenant(tenant_id)
+            engine = ValidationEngine(db.session, tenant_id, rules_bundle)
+            return engine.ingest_and_validate_chunks(_normalize_columns(df) for df in chunks)
+    finally:
+        _invalidate_chart_data(tenant_id)
+        os.remove(path)
+
+
+def _read_csv(stream):
+    """Parse a whole CSV stream as strings with the delimiter detected from its head"""
+    options = {
+        "dtype": str,
+        "keep_default_na": False,
+        "na_filter": False,
+        "sep": _detect_delimiter(stream.read(_SNIFF_BYTES)),
+    }
+    if _CSV_ENGINE == "pyarrow":
+        try:
+            stream.seek(0)
+            return pd.read_csv(stream, engine="pyarrow", **options)
+        except Exception:  # noqa: BLE001
+            # Files Arrow rejects go to the C parser, which also gives the clearer error
+            pass
+    stream.seek(0)
+    return pd.read_csv(stream, engine="c", **options)
+
+
+def _read_csv_chunks(stream, chunk_rows: int):
+    """Parse a CSV stream chunk by chunk.
+
+    The delimiter is detected from the head of the stream; chunks are parsed
+    lazily, and a malformed row in a later chunk raises ValueError.
+    """
+    sep = _detect_delimiter(stream.read(_SNIFF_BYTES))
+    stream.seek(0)
+    reader = pd.read_csv(
+        stream,
+        dtype=str,
+        keep_default_na=False,
+        na_filter=False,
+        sep=sep,
+        engine="c",
+        chunksize=chunk_rows,
+    )
+    return _chain_chunks(next(reader), reader)
+
+
+def _chain_chunks(first, reader):
+    yield first
+    try:
+        yield from reader
+    except pd.errors.ParserError as exc:
+        raise ValueError(f"failed to parse file: {exc}") from exc
+
+
+def _normalize_columns(df):
+    """Normalize uploaded column names and aliases, and mirror claim_id/unique_id"""
+    # Normalize column names (trim, lower)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    # Map common aliases to required columns (names absent from df are ignored)
+    df.rename(columns=_COLUMN_ALIASES, inplace=True)
+    # Align identifiers: if only one of claim_id/unique_id is provided, mirror it
+    if "claim_id" not in df.columns and "unique_id" in df.columns:
+        df["claim_id"] = df["unique_id"].astype(str)
+    elif "unique_id" not in df.columns and "claim_id" in df.columns:
+        df["unique_id"] = df["claim_id"].astype(str)
+    return df
+
+
 def _get_chart_data(tenant_id: str) -> dict:
-    """Get chart data from Metrics table"""
+    """Get chart data from Metrics table, cached per tenant for _CHART_TTL_SECONDS"""
+    now = time.monotonic()
+    cached = _CHART_CACHE.get(tenant_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
     try:
-        # Get claim counts by error type
-        claim_counts = db.session.query(
-            Metrics.error_category,
-            func.sum(Metrics.claim_count)
-        ).filter(
-            Metrics.tenant_id == tenant_id
-        ).group_by(Metrics.error_category).all()
-        
-        # Get paid amounts by error type
-        paid_amounts = db.session.query(
-            Metrics.error_category,
-            func.sum(Metrics.paid_sum)
-        ).filter(
-            Metrics.tenant_id == tenant_id
-        ).group_by(Metrics.error_category).all()
-        
-        # Convert to dictionaries
-        claim_counts_by_error = {error_type: int(count) for error_type, count in claim_counts}
-        paid_amount_by_error = {error_type: float(amount) for error_type, amount in paid_amounts}
-        
-        return {
-            "claim_counts_by_error": claim_counts_by_error,
-            "paid_amount_by_error": paid_amount_by_error
-        }
-        
+        # Claim counts and paid amounts by error type, aggregated in one pass
+        rows = db.session.execute(
+            select(
+                Metrics.error_category,
+                func.sum(Metrics.claim_count).label("cc"),
+                func.sum(Metrics.paid_sum).label("ps"),
+            ).where(Metrics.tenant_id == tenant_id).group_by(Metrics.error_category)
+        ).all()
     except Exception as e:
         return {
             "claim_counts_by_error": {},
             "paid_amount_by_error": {}
         }
 
+    chart_data = {
+        "claim_counts_by_error": {row.error_category: int(row.cc) for row in rows},
+        "paid_amount_by_error": {row.error_category: float(row.ps) for row in rows}
+    }
+    _CHART_CACHE[tenant_id] = (now + _CHART_TTL_SECONDS, chart_data)
+    return chart_data
+
+
+def _invalidate_chart_data(tenant_id: str) -> None:
+    """Drop a tenant's cached chart data after a run that rewrites its metrics"""
+    _CHART_CACHE.pop(tenant_id, None)
+
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Enum as SAEnum
+from sqlalchemy import Enum as SAEnum, Index
 from ..extensions import db
 from sqlalchemy.types import JSON
 
@@ -10,7 +10,17 @@ StatusEnum = SAEnum("Validated", "Not Validated", "pending", name="status_enum")
 
 class Master(db.Model):
     __tablename__ = "claims_master"
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        # Composite indexes for the per-tenant lookups made by the agent's database tool
+        Index("ix_claims_tenant_service", "tenant_id", "service_code"),
+        Index("ix_claims_tenant_claim", "tenant_id", "claim_id", unique=True),
+        # Newest-first claim listing per tenant
+        Index("ix_claims_tenant_created", "tenant_id", "created_at"),
+        # Index-only counts for the listing's status / error_type filters
+        Index("ix_claims_tenant_status", "tenant_id", "status"),
+        Index("ix_claims_tenant_error_type", "tenant_id", "error_type"),
+        {"sqlite_autoincrement": True},
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     claim_id = db.Column(db.String(64), unique=True, nullable=False)  # Primary identifier
     encounter_type = db.Column(db.String(64))
@@ -33,7 +43,11 @@ class Master(db.Model):
     
     @property
     def unique_id(self) -> str:
-        """unique_id is always the same as claim_id - they are the same identifier"""
+        """unique_id is always the same as claim_id - they are the same identifier
+
+        A plain property rather than a column_property so it also reads correctly on
+        claims that have not been flushed yet, which is when validation runs.
+        """
         return self.claim_id
     
     @unique_id.setter
@@ -71,7 +85,12 @@ class Metrics(db.Model):
 
 class Audit(db.Model):
     __tablename__ = "claims_audit"
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        # Newest-first audit listing per tenant, and its claim_id filter
+        Index("ix_audit_tenant_timestamp", "tenant_id", "timestamp"),
+        Index("ix_audit_tenant_claim", "tenant_id", "claim_id"),
+        {"sqlite_autoincrement": True},
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     claim_id = db.Column(db.String(64), db.ForeignKey("claims_master.claim_id"), nullable=False)
     action = db.Column(db.String(128), nullable=False)  # e.g., "validation_started", "tool_used", "validation_completed"
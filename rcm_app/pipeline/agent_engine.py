@@ -12,6 +12,7 @@ from flask import current_app
 from rcm_app.extensions import db
 from rcm_app.models.models import Master, Refined, Metrics, Audit
 from rcm_app.rules.loader import RulesBundle
+from rcm_app.pipeline.engine import fetch_claims
 from rcm_app.agent import RCMValidationAgent, AgentResult
 
 
@@ -81,11 +82,7 @@ class AgentValidationEngine:
     
     def validate_specific_claims(self, claim_ids: List[str]) -> dict[str, Any]:
         """Validate specific claims using AI agent"""
-        claims = Master.query.filter(
-            Master.tenant_id == self.tenant_id, 
-            Master.claim_id.in_(claim_ids)
-        ).all()
-        return self._validate_claims_with_agent(claims)
+        return self._validate_claims_with_agent(fetch_claims(self.tenant_id, claim_ids))
     
     def _validate_claims_with_agent(self, claims: List[Master]) -> dict[str, Any]:
         """Validate claims using AI agent"""
@@ -94,15 +91,16 @@ class AgentValidationEngine:
         agent_errors = 0
         
         for claim in claims:
+            # Log validation start
+            self._log_audit(claim.claim_id, "validation_started", "success", {
+                "claim_data": self._claim_to_dict(claim)
+            })
+        
+        # Use AI agent for validation, running the claims' agent loops concurrently
+        agent_results = self.agent.validate_claims_batch(claims)
+        
+        for claim, agent_result in zip(claims, agent_results):
             try:
-                # Log validation start
-                self._log_audit(claim.claim_id, "validation_started", "success", {
-                    "claim_data": self._claim_to_dict(claim)
-                })
-                
-                # Use AI agent for validation
-                agent_result = self.agent.validate_claim(claim)
-                
                 # Update claim with agent results
                 claim.status = agent_result.status
                 claim.error_type = agent_result.error_type
@@ -5,13 +5,20 @@ from dataclasses import dataclass
 from uuid import uuid4
 from typing import Any
 from flask import current_app
+from sqlalchemy import insert
 from ..extensions import db
 from ..models.models import Master, Refined, Metrics, Audit
 from ..rules.loader import RulesBundle
 from ..utils.llm import GeminiClient
+from ..utils.sqlite import optimize_sqlite
 from ..utils.validators import Validator
 
 
+# Claim ids per IN lookup (see fetch_claims) and rows per executemany INSERT during ingestion
+_LOOKUP_BATCH = 500
+_INSERT_BATCH = 1000
+
+
 @dataclass
 class ValidationSummary:
     inserted: int
@@ -25,9 +32,28 @@ class ValidationEngine:
         self.tenant_id = tenant_id
         self.rules = rules
         self.llm = GeminiClient()
-        self.validator = Validator(self.rules)
+        self.validator = Validator.for_rules(self.rules)
 
     def ingest_and_validate_dataframe(self, df) -> dict[str, Any]:  # pandas DF
+        return self.ingest_and_validate_chunks([df])
+
+    def ingest_and_validate_chunks(self, chunks) -> dict[str, Any]:  # iterable of pandas DFs
+        """Ingest DataFrame chunks one at a time, then commit and validate the new claims once.
+
+        Only one chunk is held in memory at a time, so uploads can be parsed as a stream.
+        """
+        inserted = 0
+        for df in chunks:
+            inserted += self._ingest_dataframe(df)
+        self.session.commit()
+        # Bulk inserts shift the claim tables' statistics; refresh them before validation queries
+        optimize_sqlite(db.engine)
+
+        stats = self._validate_new_claims()
+        return {"inserted": inserted, **stats}
+
+    def _ingest_dataframe(self, df) -> int:
+        """Upsert one DataFrame's claims into the session; returns the number of new claims"""
         required_cols = [
             # claim_id can be auto-generated when missing
             "encounter_type","service_date","national_id","member_id","facility_id",
@@ -37,57 +63,43 @@ class ValidationEngine:
             if col not in df.columns:
                 raise ValueError(f"missing required column: {col}")
 
-        inserted = 0
-        for _, row in df.iterrows():
+        rows = []
+        for row in df.to_dict(orient="records"):
             # claim_id and unique_id are the same identifier - use whichever is provided
             input_claim_id = str(row.get("claim_id")) if "claim_id" in df.columns else None
             input_unique_id = str(row.get("unique_id")) if "unique_id" in df.columns else None
             # Canonicalize identifier: prefer explicit claim_id; else unique_id; else UUID
             canonical_id = (input_claim_id or input_unique_id or str(uuid4())).strip()
-            
-            # Upsert by (tenant_id, claim_id) to avoid unique constraint failures
-            existing = Master.query.filter(
-                Master.tenant_id == self.tenant_id,
-                Master.claim_id == canonical_id,
-            ).first()
-            if existing:
-                claim = existing
-                claim.encounter_type = str(row.get("encounter_type")) if row.get("encounter_type") is not None else claim.encounter_type
-                claim.service_date = pd_to_date(row.get("service_date")) or claim.service_date
-                claim.national_id = upper_or_none(row.get("national_id")) or claim.national_id
-                claim.member_id = upper_or_none(row.get("member_id")) or claim.member_id
-                claim.facility_id = upper_or_none(row.get("facility_id")) or claim.facility_id
-                # unique_id is automatically set via property setter
-                claim.unique_id = canonical_id
-                claim.diagnosis_codes = split_codes(row.get("diagnosis_codes")) or claim.diagnosis_codes
-                claim.service_code = upper_or_none(row.get("service_code")) or claim.service_code
-                claim.paid_amount_aed = to_decimal(row.get("paid_amount_aed")) or claim.paid_amount_aed
-                claim.approval_number = upper_or_none(row.get("approval_number")) or claim.approval_number
+            rows.append((canonical_id, claim_fields(row)))
+
+        # Upsert by (tenant_id, claim_id) to avoid unique constraint failures; existing claims
+        # are looked up per batch of ids rather than per row
+        existing = {
+            claim.claim_id: claim
+            for claim in fetch_claims(self.tenant_id, (canonical_id for canonical_id, _ in rows))
+        }
+
+        new_claims: dict[str, dict[str, Any]] = {}
+        for canonical_id, fields in rows:
+            claim = existing.get(canonical_id)
+            if claim is not None:
+                for name, value in merge_claim_fields({name: getattr(claim, name) for name in fields}, fields).items():
+                    setattr(claim, name, value)
                 self.session.add(claim)
+            elif canonical_id in new_claims:
+                # Repeated id within the upload: merged exactly as an update of the first row
+                new_claims[canonical_id].update(merge_claim_fields(new_claims[canonical_id], fields))
             else:
-                claim = Master(
-                    claim_id=canonical_id,  # This automatically sets unique_id via property
-                    encounter_type=str(row.get("encounter_type")) if row.get("encounter_type") is not None else None,
-                    service_date=pd_to_date(row.get("service_date")),
-                    national_id=upper_or_none(row.get("national_id")),
-                    member_id=upper_or_none(row.get("member_id")),
-                    facility_id=upper_or_none(row.get("facility_id")),
-                    diagnosis_codes=split_codes(row.get("diagnosis_codes")),
-                    service_code=upper_or_none(row.get("service_code")),
-                    paid_amount_aed=to_decimal(row.get("paid_amount_aed")),
-                    approval_number=upper_or_none(row.get("approval_number")),
-                    tenant_id=self.tenant_id,
-                )
-                self.session.add(claim)
-                inserted += 1
-        self.session.commit()
+                new_claims[canonical_id] = {"claim_id": canonical_id, "tenant_id": self.tenant_id, **fields}
 
-        stats = self._validate_new_claims()
-        return {"inserted": inserted, **stats}
+        # New claims go in as executemany batches, bypassing per-object unit-of-work overhead
+        records = list(new_claims.values())
+        for start in range(0, len(records), _INSERT_BATCH):
+            self.session.execute(insert(Master), records[start:start + _INSERT_BATCH])
+        return len(records)
 
     def validate_specific_claims(self, claim_ids: list[str]) -> dict[str, Any]:
-        claims = Master.query.filter(Master.tenant_id == self.tenant_id, Master.claim_id.in_(claim_ids)).all()
-        return self._validate_claims_list(claims)
+        return self._validate_claims_list(fetch_claims(self.tenant_id, claim_ids))
 
     def _validate_new_claims(self) -> dict[str, Any]:
         claims = Master.query.filter_by(tenant_id=self.tenant_id, status="pending").all()
@@ -573,6 +585,47 @@ class ValidationEngine:
         db.session.commit()
 
 
+def fetch_claims(tenant_id: str, claim_ids) -> list[Master]:
+    """A tenant's claims with the given ids, fetched with one IN query per _LOOKUP_BATCH ids.
+
+    Repeated ids are fetched once; ids with no matching claim are skipped.
+    """
+    ids = list(dict.fromkeys(claim_ids))
+    claims: list[Master] = []
+    for start in range(0, len(ids), _LOOKUP_BATCH):
+        claims.extend(Master.query.filter(
+            Master.tenant_id == tenant_id,
+            Master.claim_id.in_(ids[start:start + _LOOKUP_BATCH]),
+        ))
+    return claims
+
+
+def claim_fields(row) -> dict[str, Any]:
+    """Master column values parsed from one uploaded row"""
+    return {
+        "encounter_type": str(row.get("encounter_type")) if row.get("encounter_type") is not None else None,
+        "service_date": pd_to_date(row.get("service_date")),
+        "national_id": upper_or_none(row.get("national_id")),
+        "member_id": upper_or_none(row.get("member_id")),
+        "facility_id": upper_or_none(row.get("facility_id")),
+        "diagnosis_codes": split_codes(row.get("diagnosis_codes")),
+        "service_code": upper_or_none(row.get("service_code")),
+        "paid_amount_aed": to_decimal(row.get("paid_amount_aed")),
+        "approval_number": upper_or_none(row.get("approval_number")),
+    }
+
+
+def merge_claim_fields(current: dict[str, Any], incoming: dict[str, Any]) -> dict[str, Any]:
+    """Fields of a re-uploaded claim: incoming values win unless empty"""
+    merged = {name: incoming[name] or current[name] for name in incoming}
+    # encounter_type is replaced whenever the upload provides one, even an empty one
+    if incoming["encounter_type"] is not None:
+        merged["encounter_type"] = incoming["encounter_type"]
+    else:
+        merged["encounter_type"] = current["encounter_type"]
+    return merged
+
+
 def pd_to_date(val):
     try:
         import pandas as pd  # local import to avoid hard dep here
@@ -0,0 +1,77 @@
+"""
+In-process background jobs for long-running ingestion work
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+from uuid import uuid4
+from flask import Flask
+from rcm_app.utils.cache import BoundedDict
+
+# Job id -> status record; the oldest records are dropped once the registry is full
+_JOBS: BoundedDict = BoundedDict(1024)
+_JOBS_LOCK = threading.Lock()
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    """Worker pool shared by every app in the process, sized by JOB_WORKERS"""
+    global _EXECUTOR
+    with _JOBS_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=int(os.getenv("JOB_WORKERS", "2")),
+                thread_name_prefix="rcm-job",
+            )
+        return _EXECUTOR
+
+
+def _update(job_id: str, **fields: Any) -> None:
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+
+def submit_job(app: Flask, owner: str, fn: Callable[..., Any], *args: Any) -> str:
+    """Run fn(*args) on the worker pool inside an app context; returns the job id.
+
+    owner identifies who may read the job back. The job's status moves
+    queued -> running -> finished (with fn's result) or failed (with the
+    error message).
+    """
+    job_id = uuid4().hex
+    with _JOBS_LOCK:
+        _JOBS[job_id] = {
+            "job_id": job_id,
+            "owner": owner,
+            "status": "queued",
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+    def run() -> None:
+        _update(job_id, status="running")
+        try:
+            with app.app_context():
+                result = fn(*args)
+        except Exception as exc:  # noqa: BLE001
+            app.logger.exception(f"job {job_id} failed: {exc}")
+            _update(job_id, status="failed", error=str(exc), finished_at=datetime.utcnow().isoformat())
+        else:
+            _update(job_id, status="finished", result=result, finished_at=datetime.utcnow().isoformat())
+
+    _executor().submit(run)
+    return job_id
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    """Snapshot of a job's status record, or None if unknown"""
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+        return dict(job) if job is not None else None
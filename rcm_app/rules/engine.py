@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Any, Callable, Tuple
 
 from ..models.models import Master
+from ..utils.validators import is_valid_unique_id
 from .loader import RulesBundle
 
 
@@ -51,8 +52,7 @@ class UniqueIdFormatRule(BaseRule):
         uid = (claim.unique_id or "").strip().upper()
         if not uid:
             return issues
-        import re
-        if not re.fullmatch(r"^[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}$", uid):
+        if not is_valid_unique_id(uid):
             issues.append(RuleIssue(
                 category=self.category,
                 message="unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX)",
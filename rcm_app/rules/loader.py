@@ -1,14 +1,15 @@
 import json
 import os
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 
 @dataclass
 class RulesBundle:
-    services_requiring_approval: set[str]
-    diagnoses: set[str]
-    diagnoses_requiring_approval: set[str]
+    services_requiring_approval: frozenset[str]
+    diagnoses: frozenset[str]
+    diagnoses_requiring_approval: frozenset[str]
     paid_threshold_aed: float
     id_rules: dict
     raw_rules_text: str
@@ -16,17 +17,56 @@ class RulesBundle:
     service_allowed_facility_types: dict
 
 
+# Parsed bundles per (base_path, tenant_id), reused until a config or rules file changes on disk:
+# (source signature, bundle, time.monotonic() of the last signature check)
+_RULES_CACHE: dict[tuple[str, str], tuple[tuple, RulesBundle, float]] = {}
+
+
 class TenantConfigLoader:
-    def __init__(self, base_path: Optional[str] = None) -> None:
+    def __init__(self, base_path: Optional[str] = None, check_interval: float = 0.0) -> None:
+        """check_interval: seconds a cached bundle is served before its files are stat'ed again"""
         self.base_path = base_path or os.getcwd()
+        self.check_interval = check_interval
+
+    def clear_cache(self, tenant_id: Optional[str] = None) -> int:
+        """Drop cached bundles under this base path (one tenant's, or all); returns how many"""
+        keys = [key for key in _RULES_CACHE if key[0] == self.base_path and tenant_id in (None, key[1])]
+        for key in keys:
+            _RULES_CACHE.pop(key, None)
+        return len(keys)
 
     def _tenant_config_path(self, tenant_id: str) -> str:
         return os.path.join(self.base_path, "configs", f"tenant_{tenant_id}.json")
 
+    def _source_signature(self, cfg_path: str, tenant_id: str) -> tuple:
+        """Modification times of the tenant config and every file in its rules directory."""
+        rules_dir = os.path.join(self.base_path, "rules", tenant_id)
+        try:
+            entries = sorted((e.name, e.stat().st_mtime_ns) for e in os.scandir(rules_dir) if e.is_file())
+        except FileNotFoundError:
+            entries = []
+        return (os.stat(cfg_path).st_mtime_ns, tuple(entries))
+
     def load_rules_for_tenant(self, tenant_id: str) -> RulesBundle:
+        key = (self.base_path, tenant_id)
+        cached = _RULES_CACHE.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[2] < self.check_interval:
+            return cached[1]
+
         cfg_path = self._tenant_config_path(tenant_id)
         if not os.path.exists(cfg_path):
             raise FileNotFoundError(f"tenant config not found: {cfg_path}")
+
+        signature = self._source_signature(cfg_path, tenant_id)
+        if cached is not None and cached[0] == signature:
+            _RULES_CACHE[key] = (signature, cached[1], now)
+            return cached[1]
+        bundle = self._parse_rules(cfg_path, tenant_id)
+        _RULES_CACHE[key] = (signature, bundle, now)
+        return bundle
+
+    def _parse_rules(self, cfg_path: str, tenant_id: str) -> RulesBundle:
         with open(cfg_path, "r", encoding="utf-8") as fh:
             cfg = json.load(fh)
 
@@ -87,10 +127,11 @@ class TenantConfigLoader:
         saf.setdefault("SRV2001", ["CARDIOLOGY_CENTER"])   # ECG
         saf.setdefault("SRV2011", ["CARDIOLOGY_CENTER"])   # Stress test
 
+        # Bundles are cached and shared across requests, so their rule sets are frozen
         return RulesBundle(
-            services_requiring_approval=services,
-            diagnoses=diagnoses,
-            diagnoses_requiring_approval=diagnoses_requiring_approval,
+            services_requiring_approval=frozenset(services),
+            diagnoses=frozenset(diagnoses),
+            diagnoses_requiring_approval=frozenset(diagnoses_requiring_approval),
             paid_threshold_aed=threshold,
             id_rules=id_rules,
             raw_rules_text=raw_rules_text,
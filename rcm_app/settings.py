@@ -12,6 +12,7 @@ class AppConfig:
     google_api_key: Optional[str]
     default_tenant_id: str
     max_upload_mb: int
+    upload_chunk_rows: int = 10000
 
     @property
     def max_upload_bytes(self) -> int:
@@ -30,4 +31,5 @@ class AppConfig:
             google_api_key=os.getenv("GOOGLE_API_KEY"),
             default_tenant_id=os.getenv("DEFAULT_TENANT_ID", "tenant_demo"),
             max_upload_mb=int(os.getenv("MAX_UPLOAD_SIZE_MB", "25")),
+            upload_chunk_rows=int(os.getenv("UPLOAD_CHUNK_ROWS", "10000")),
         )
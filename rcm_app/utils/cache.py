@@ -0,0 +1,36 @@
+"""
+Size-bounded in-process caches
+"""
+
+from typing import Any, Callable, Hashable
+
+
+class BoundedDict(dict):
+    """dict holding at most maxsize entries.
+
+    Storing a new key once full evicts the oldest inserted key first (FIFO).
+    Only item assignment enforces the bound; update() and setdefault() do not.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        if key not in self and len(self) >= self.maxsize:
+            self.pop(next(iter(self), None), None)
+        super().__setitem__(key, value)
+
+
+def for_bundle(registry: BoundedDict, bundle: Any, factory: Callable[[Any], Any]) -> Any:
+    """Value derived from bundle, built by factory(bundle) on first use.
+
+    The registry is keyed by id(bundle) and holds (bundle, value) pairs; the
+    stored bundle guards against a new bundle reusing a freed bundle's id.
+    """
+    cached = registry.get(id(bundle))
+    if cached is not None and cached[0] is bundle:
+        return cached[1]
+    value = factory(bundle)
+    registry[id(bundle)] = (bundle, value)
+    return value
@@ -0,0 +1,33 @@
+"""
+orjson-backed JSON provider for Flask responses
+"""
+
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+
+# orjson serializes in C; without it the app keeps Flask's stdlib provider
+try:
+    import orjson
+except Exception:  # noqa: BLE001
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask's default JSON behaviour, serialized by orjson.
+
+    Dates and dataclasses are passed through to DefaultJSONProvider.default so
+    responses keep Flask's formats (HTTP dates, Decimal as str). Output is
+    UTF-8 rather than ASCII-escaped.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        option |= orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
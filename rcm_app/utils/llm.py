@@ -50,6 +50,36 @@ Output JSON format:
 """
 
 
+class _JsonObjectScanner:
+    """Tracks brace depth across streamed text to spot where the first JSON object closes."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk; True once an opened top-level object has been closed."""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                # Strings only matter inside the object; prose quotes before it are ignored
+                self.in_string = self.depth > 0
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
 class GeminiClient:
     def __init__(self) -> None:
         # Prefer environment key; fallback to provided hardcoded key if missing
@@ -117,6 +147,37 @@ class GeminiClient:
             print(f"Gemini API error: {e}")
             return None
     
+    def _stream_text(self, prompt: str) -> Optional[str]:
+        """Stream a response, stopping as soon as the first JSON object in it is complete.
+
+        The JSON verdict is all callers parse, so any text the model adds after it
+        is not waited for. Responses without a JSON object are read in full.
+        """
+        if not self.enabled:
+            return None
+        try:
+            if GENAI_MODE == "client" and self._client is not None:
+                chunks = self._client.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=prompt,
+                )
+            elif GENAI_MODE == "generativeai":
+                model = genai_legacy_lib.GenerativeModel(self.model_name)
+                chunks = model.generate_content(prompt, stream=True)
+            else:
+                return None
+            parts: list[str] = []
+            scanner = _JsonObjectScanner()
+            for chunk in chunks:
+                text = getattr(chunk, "text", None) or ""
+                parts.append(text)
+                if scanner.feed(text):
+                    break
+            return "".join(parts) or None
+        except Exception as e:
+            print(f"Gemini API error: {e}")
+            return None
+
     def enhanced_analysis(self, claim_data: dict[str, Any], rules_text: str, query: str) -> dict[str, Any] | None:
         """Enhanced analysis with specific query support"""
         if not self.enabled:
@@ -128,7 +189,7 @@ class GeminiClient:
                 query=query
             )
             
-            response = self._generate_text(prompt)
+            response = self._stream_text(prompt)
             if not response:
                 return None
             
@@ -0,0 +1,35 @@
+"""
+SQLite planner maintenance
+"""
+
+import atexit
+import weakref
+from sqlalchemy.engine import Engine
+
+# Engines to optimize and dispose at process exit; held weakly so apps built and dropped
+# (tests, reloads) are not kept alive until then
+_EXIT_ENGINES: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def optimize_sqlite(engine: Engine) -> None:
+    """Run PRAGMA optimize on SQLite so the planner sees current table statistics; no-op otherwise."""
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA optimize")
+    except Exception:  # noqa: BLE001
+        # Best-effort; statistics are refreshed on the next run
+        pass
+
+
+def optimize_at_exit(engine: Engine) -> None:
+    """Optimize and dispose engine when the process exits"""
+    _EXIT_ENGINES.add(engine)
+
+
+@atexit.register
+def _shutdown_engines() -> None:
+    for engine in list(_EXIT_ENGINES):
+        optimize_sqlite(engine)
+        engine.dispose()
@@ -2,9 +2,28 @@ import re
 from typing import Any
 from ..models.models import Master
 from ..rules.loader import RulesBundle
+from .cache import BoundedDict, for_bundle
+
+# unique_id is fixed-width XXXX-XXXX-XXXX (uppercase alphanumeric)
+UNIQUE_ID_RE = re.compile(r"[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}")
+
+
+def is_valid_unique_id(value: str) -> bool:
+    """Reject anything that is not 14 characters before running the regex."""
+    return len(value) == 14 and UNIQUE_ID_RE.fullmatch(value) is not None
+
+
+# id(RulesBundle) -> (bundle, Validator); bundles are cached per tenant and replaced when
+# their rule files change, so each one needs its validator built only once
+_VALIDATOR_CACHE: BoundedDict = BoundedDict(32)
 
 
 class Validator:
+    @classmethod
+    def for_rules(cls, rules: RulesBundle) -> "Validator":
+        """Shared Validator for a rules bundle; validators hold no per-claim state."""
+        return for_bundle(_VALIDATOR_CACHE, rules, cls)
+
     def __init__(self, rules: RulesBundle) -> None:
         self.rules = rules
         self.id_patterns = {
@@ -57,13 +76,14 @@ class Validator:
                     types.add("Technical")
                     current_app.logger.debug(f"  Uppercase error: {fld}={val}")
         
-        # Unique ID validation - format and content
-        if claim.unique_id:
+        # Unique ID validation - format and content (read once; Master.unique_id is a property)
+        uid = claim.unique_id
+        if uid:
             # Check if unique_id is in correct format (uppercase with hyphens)
-            if not re.fullmatch(r"^[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}$", claim.unique_id or ""):
+            if not is_valid_unique_id(uid):
                 errors.append("unique_id is invalid: must be uppercase alphanumeric with hyphen-separated format (XXXX-XXXX-XXXX)")
                 types.add("Technical")
-                current_app.logger.debug(f"  Unique ID format error: {claim.unique_id}")
+                current_app.logger.debug(f"  Unique ID format error: {uid}")
             # Check content matches first4(national_id)-middle4(member_id)-last4(facility_id)
             ni = (claim.national_id or "").strip().upper()
             mi = (claim.member_id or "").strip().upper()
@@ -74,10 +94,10 @@ class Validator:
                 middle4 = mi[:4].ljust(4, "X")
                 last4 = fi[-4:].rjust(4, "X")
                 expected_uid = f"{first4}-{middle4}-{last4}"
-                if (claim.unique_id or "").strip().upper() != expected_uid:
+                if uid.strip().upper() != expected_uid:
                     errors.append(f"unique_id format is invalid (should be {expected_uid}).")
                     types.add("Technical")
-                    current_app.logger.debug(f"  Unique ID content mismatch: got={claim.unique_id}, expected={expected_uid}")
+                    current_app.logger.debug(f"  Unique ID content mismatch: got={uid}, expected={expected_uid}")
 
         for fld, pat in self.id_patterns.items():
             val = getattr(claim, fld, None)
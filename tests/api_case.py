@@ -0,0 +1,42 @@
+"""
+Shared fixture for API tests: an app on a throwaway SQLite database
+"""
+
+import shutil
+import tempfile
+import unittest
+from flask_jwt_extended import create_access_token
+from rcm_app import create_app
+from rcm_app.api import claims
+from rcm_app.extensions import db
+from rcm_app.settings import AppConfig
+
+
+class ApiTestCase(unittest.TestCase):
+    """Test client for a fresh app whose database is deleted after each test"""
+
+    tenant_id = "tenant_demo"
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        cfg = AppConfig.from_env()
+        cfg.database_url = f"sqlite:///{self.tmpdir}/rcm.db"
+        self.app = create_app(cfg)
+        self.client = self.app.test_client()
+        # Chart data is cached per tenant across apps; each test starts from its own database
+        claims._CHART_CACHE.clear()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def auth(self, tenant_id: str | None = None, identity: str = "admin", roles: list | None = None) -> dict:
+        """Authorization header for a token scoped to tenant_id (the test tenant by default)"""
+        token_claims = {"tenant_id": tenant_id or self.tenant_id}
+        if roles is not None:
+            token_claims["roles"] = roles
+        with self.app.app_context():
+            token = create_access_token(identity=identity, additional_claims=token_claims)
+        return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,75 @@
+"""
+Tests for the agent's per-claim result cache
+"""
+
+import os
+import threading
+import unittest
+from unittest.mock import Mock
+from rcm_app.agent.react_agent import RCMValidationAgent
+from rcm_app.agent.tools.validation_tools import ValidationTools
+from rcm_app.models.models import Master
+from rcm_app.rules.loader import TenantConfigLoader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _claim(claim_id: str) -> Master:
+    """Claim with two static rule errors (approval-only service and amount over threshold, no approval)"""
+    return Master(
+        claim_id=claim_id,
+        encounter_type="INPATIENT",
+        national_id="ABCD1234",
+        member_id="EFGH5678",
+        facility_id="IJKL9012",
+        diagnosis_codes=["E66.9"],
+        service_code="SRV1001",
+        paid_amount_aed=500,
+        approval_number="NA",
+        tenant_id="tenant_demo",
+    )
+
+
+class TestAgentResultCache(unittest.TestCase):
+    """Claims differing only in whether unique_id matches the ID fields must not share a verdict"""
+
+    def setUp(self):
+        rules = TenantConfigLoader(ROOT).load_rules_for_tenant("tenant_demo")
+        # Skip __init__ so no LLM client is built; only the state validate_claim touches is set
+        self.agent = RCMValidationAgent.__new__(RCMValidationAgent)
+        self.agent.session = Mock()
+        self.agent.rules = rules
+        self.agent.validation_tools = ValidationTools(rules, self.agent.session)
+        self.agent._session_lock = threading.Lock()
+        self.agent._result_cache = {}
+        self.agent.agent = Mock()
+        self.agent.agent.invoke.side_effect = [
+            {"output": '{"status": "Not Validated", "error_type": "Technical", "error_explanation": ["a"], '
+                       '"recommended_action": ["b"], "confidence": 0.9}'},
+            {"output": '{"status": "Not Validated", "error_type": "Technical", "error_explanation": ["c"], '
+                       '"recommended_action": ["d"], "confidence": 0.9}'},
+        ]
+        self.matching = _claim("ABCD-EFGH-IJKL")
+        self.mismatching = _claim("ZZZZ-ZZZZ-ZZZZ")
+
+    def test_unique_id_match_is_part_of_key(self):
+        self.assertNotEqual(self.agent._cache_key(self.matching), self.agent._cache_key(self.mismatching))
+
+    def test_same_shape_claims_with_matching_unique_id_share_key(self):
+        self.assertEqual(self.agent._cache_key(self.matching), self.agent._cache_key(_claim("ABCD-EFGH-IJKL")))
+
+    def test_mismatching_unique_id_runs_agent_again(self):
+        self.assertIsNone(self.agent._fast_verdict(self.matching))
+        self.assertIsNone(self.agent._fast_verdict(self.mismatching))
+
+        first = self.agent.validate_claim(self.matching)
+        second = self.agent.validate_claim(self.mismatching)
+
+        self.assertEqual(self.agent.agent.invoke.call_count, 2)
+        self.assertEqual(first.error_explanation, ["a"])
+        self.assertEqual(second.error_explanation, ["c"])
+        self.assertNotEqual(second.agent_reasoning, "[cache hit]")
+
+
+if __name__ == "__main__":
+    unittest.main()
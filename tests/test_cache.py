@@ -0,0 +1,49 @@
+"""
+Unit tests for the bounded cache helpers
+"""
+
+import unittest
+from rcm_app.utils.cache import BoundedDict, for_bundle
+
+
+class TestBoundedDict(unittest.TestCase):
+    """FIFO eviction and bundle-identity lookups"""
+
+    def test_evicts_oldest_key_when_full(self):
+        cache = BoundedDict(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["c"] = 3
+        self.assertEqual(list(cache.items()), [("b", 2), ("c", 3)])
+
+    def test_overwriting_existing_key_does_not_evict(self):
+        cache = BoundedDict(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"] = 10
+        self.assertEqual(cache, {"a": 10, "b": 2})
+
+    def test_for_bundle_builds_once_per_bundle(self):
+        registry = BoundedDict(4)
+        bundle, other = object(), object()
+        calls = []
+
+        def factory(b):
+            calls.append(b)
+            return len(calls)
+
+        self.assertEqual(for_bundle(registry, bundle, factory), 1)
+        self.assertEqual(for_bundle(registry, bundle, factory), 1)
+        self.assertEqual(for_bundle(registry, other, factory), 2)
+        self.assertEqual(calls, [bundle, other])
+
+    def test_for_bundle_rebuilds_when_id_is_reused(self):
+        registry = BoundedDict(4)
+        bundle, stale = object(), object()
+        # A stale entry under this bundle's id, as left by a freed bundle
+        registry[id(bundle)] = (stale, "stale")
+        self.assertEqual(for_bundle(registry, bundle, lambda b: "fresh"), "fresh")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Tests for missing approval numbers in the corrected validator
+"""
+
+import os
+import unittest
+import pandas as pd
+from corrected_validation import CorrectedRCMValidator, process_claims_corrected
+
+CLAIMS_TEST_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "claims_test.csv")
+
+
+class TestMissingApproval(unittest.TestCase):
+    """Approval numbers read as NaN count as missing, like "NA" and blank ones"""
+
+    def test_claims_test_csv(self):
+        claims = {claim["claim_id"]: claim for claim in process_claims_corrected(CLAIMS_TEST_CSV)["claims"]}
+        self.assertEqual({claim_id: claim["error_type"] for claim_id, claim in claims.items()}, {
+            1: "Technical error",
+            2: "Medical error",
+            3: "Both",
+            4: "Technical error",
+            5: "No error",
+        })
+        self.assertIn("SRV1003 requires prior approval.", claims[1]["error_explanation"])
+        self.assertIn("Diagnosis R07.9 requires prior approval.", claims[3]["error_explanation"])
+        self.assertEqual(claims[4]["recommended_action"], ["Obtain prior approval for SRV1003", "Obtain prior approval for paid amount"])
+
+    def test_frame_matches_claim(self):
+        validator = CorrectedRCMValidator()
+        rows = [
+            {
+                "claim_id": i, "encounter_type": "INPATIENT", "service_date": "1/1/2025",
+                "national_id": "J45NUMBE", "member_id": "UZF615NA", "facility_id": "0DBYE6KP",
+                "unique_id": "J45N-UZF6-E6KP", "diagnosis_codes": "E66.9", "service_code": "SRV1003",
+                "paid_amount_aed": 559.91, "approval_number": approval,
+            }
+            for i, approval in enumerate([float("nan"), None, "NA", "", "Obtain approval", "APP001"], start=1)
+        ]
+        per_claim = [validator.validate_claim(row) for row in rows]
+        self.assertEqual(validator.validate_frame(pd.DataFrame(rows)), per_claim)
+        self.assertEqual([claim["error_type"] for claim in per_claim], ["Technical error"] * 5 + ["No error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for DatabaseQueryTool history queries
+"""
+
+import unittest
+from sqlalchemy import event
+from rcm_app.agent.tools.database_queries import DatabaseQueryTool
+from rcm_app.extensions import db
+from rcm_app.models.models import Master
+from tests.api_case import ApiTestCase
+
+
+class TestDatabaseQueryTool(ApiTestCase):
+    """Totals are counted in SQL and only the five example claims are read"""
+
+    def setUp(self):
+        super().setUp()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.addCleanup(self.ctx.pop)
+        error_types = ["Technical error", "Medical error", None, "No error"]
+        for i in range(12):
+            db.session.add(Master(
+                claim_id=f"C{i:02d}",
+                service_code="SRV1001" if i < 10 else "SRV2001",
+                diagnosis_codes=["E11.9"] if i % 2 else ["I10"],
+                error_type=error_types[i % 4],
+                status="Validated",
+                paid_amount_aed=100 + i,
+                tenant_id=self.tenant_id,
+            ))
+        db.session.add(Master(claim_id="X1", service_code="SRV1001", diagnosis_codes=["I10"], tenant_id="other_tenant"))
+        db.session.commit()
+        self.tool = DatabaseQueryTool(db.session)
+
+    def run_query(self, query_type: str, claim_id: str = "C00") -> str:
+        return self.tool._run(claim_id, self.tenant_id, query_type)
+
+    def test_similar_claims_reads_five_rows(self):
+        self.run_query("similar_claims")  # current claim lookup is cached from here on
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        self.addCleanup(event.remove, db.engine, "before_cursor_execute", record)
+        self.assertEqual(self.run_query("similar_claims"), "Similar claims found: 5 claims with same service code")
+        self.assertEqual(len(statements), 1)
+        self.assertIn("LIMIT", statements[0])
+
+    def test_service_code_history_counts_all_claims(self):
+        self.assertEqual(
+            self.run_query("service_code_history"),
+            "Service code SRV1001 history: 10 total claims, "
+            "errors: {'Medical error': 3, 'No error': 4, 'Technical error': 3}",
+        )
+
+    def test_diagnosis_history_counts_distinct_claims(self):
+        self.assertEqual(self.run_query("diagnosis_history"), "Diagnosis history: 6 claims with similar diagnosis codes")
+        self.assertEqual(self.run_query("diagnosis_history", "C01"), "Diagnosis history: 6 claims with similar diagnosis codes")
+
+    def test_unknown_claim(self):
+        for query_type in ("similar_claims", "service_code_history", "diagnosis_history"):
+            with self.subTest(query_type=query_type):
+                self.assertEqual(self.run_query(query_type, "missing"), "Claim not found")
+
+    def test_current_claims_are_bounded(self):
+        self.tool._current_claims.maxsize = 3
+        for i in range(6):
+            self.run_query("diagnosis_history", f"C{i:02d}")
+        self.assertEqual(list(self.tool._current_claims), [(f"C{i:02d}", self.tenant_id) for i in range(3, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
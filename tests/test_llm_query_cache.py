@@ -0,0 +1,42 @@
+"""
+Tests for the LLM query tool's analysis cache
+"""
+
+import unittest
+from unittest.mock import patch
+from rcm_app.agent.tools import llm_queries
+from rcm_app.agent.tools.llm_queries import LLMQueryTool
+
+
+class TestLLMQueryCache(unittest.TestCase):
+    """Repeat queries are answered from the cache, which stays bounded"""
+
+    def setUp(self):
+        patcher = patch.object(llm_queries, "GeminiClient")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.client.enhanced_analysis.side_effect = lambda claim, rules, query: {"analysis": claim["claim_id"]}
+        self.tool = LLMQueryTool()
+
+    def test_repeat_query_is_cached(self):
+        first = self.tool._run({"claim_id": "C1"}, "rules", "why")
+        second = self.tool._run({"claim_id": "C1"}, "rules", "why")
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.enhanced_analysis.call_count, 1)
+
+    def test_cache_is_bounded(self):
+        with patch.object(llm_queries, "_LLM_CACHE_SIZE", 3):
+            tool = LLMQueryTool()
+        for i in range(10):
+            tool._run({"claim_id": f"C{i}"}, "rules", "why")
+        self.assertEqual(len(tool._cache), 3)
+
+    def test_failed_query_is_not_cached(self):
+        self.client.enhanced_analysis.side_effect = None
+        self.client.enhanced_analysis.return_value = None
+        self.tool._run({"claim_id": "C1"}, "rules", "why")
+        self.assertEqual(len(self.tool._cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
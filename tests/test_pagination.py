@@ -0,0 +1,211 @@
+"""
+Tests for page and cursor pagination of /api/results and /api/audit
+"""
+
+import unittest
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from flask.json.provider import DefaultJSONProvider
+from rcm_app.api import claims
+from rcm_app.extensions import db
+from rcm_app.models.models import Audit, Master, Metrics
+from tests.api_case import ApiTestCase
+
+# Seeded rows share each timestamp in runs of TIE_RUN, so ordering relies on the id tiebreak
+ROWS = 45
+TIE_RUN = 10
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+class PaginationTestCase(ApiTestCase):
+    """Seeds ROWS claims and audit rows for the test tenant, plus noise for another tenant"""
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            for tenant_id, count in ((self.tenant_id, ROWS), ("other_tenant", 5)):
+                for i in range(count):
+                    stamp = BASE_TIME + timedelta(seconds=i // TIE_RUN)
+                    claim_id = f"{tenant_id}-{i:03d}"
+                    db.session.add(Master(
+                        claim_id=claim_id,
+                        service_code="SRV1001" if i % 2 else "SRV2001",
+                        status="Validated" if i % 3 else "Not Validated",
+                        tenant_id=tenant_id,
+                        created_at=stamp,
+                        updated_at=stamp,
+                    ))
+                    db.session.add(Audit(
+                        claim_id=claim_id,
+                        action="validation_completed",
+                        timestamp=stamp,
+                        outcome="success",
+                        tenant_id=tenant_id,
+                        created_at=stamp,
+                    ))
+            db.session.commit()
+
+    def page_walk(self, path: str, key: str, field: str, page_size: int, query: str = "") -> list:
+        ids, page = [], 1
+        while True:
+            body = self.client.get(f"{path}?page={page}&page_size={page_size}{query}", headers=self.auth()).get_json()
+            if not body[key]:
+                return ids
+            ids.extend(row[field] for row in body[key])
+            page += 1
+
+    def cursor_walk(self, path: str, key: str, field: str, page_size: int, query: str = "") -> list:
+        ids, cursor = [], None
+        while True:
+            url = f"{path}?page_size={page_size}{query}" + (f"&cursor={cursor}" if cursor else "")
+            body = self.client.get(url, headers=self.auth()).get_json()
+            ids.extend(row[field] for row in body[key])
+            cursor = body["pagination"]["next_cursor"]
+            if cursor is None:
+                return ids
+
+
+class TestCursorPagination(PaginationTestCase):
+    """Cursor walks return exactly the rows of the page walk, in the same order"""
+
+    def test_results_cursor_walk_matches_page_walk(self):
+        for page_size in (1, 7, TIE_RUN, ROWS, ROWS + 1):
+            with self.subTest(page_size=page_size):
+                pages = self.page_walk("/api/results", "claims", "claim_id", page_size)
+                cursors = self.cursor_walk("/api/results", "claims", "claim_id", page_size)
+                self.assertEqual(len(pages), ROWS)
+                self.assertEqual(cursors, pages)
+
+    def test_results_ties_ordered_by_id_descending(self):
+        ids = self.page_walk("/api/results", "claims", "claim_id", 100)
+        self.assertEqual(ids, [f"{self.tenant_id}-{i:03d}" for i in reversed(range(ROWS))])
+
+    def test_results_cursor_walk_with_filter(self):
+        query = "&status=Validated"
+        pages = self.page_walk("/api/results", "claims", "claim_id", 4, query)
+        self.assertEqual(self.cursor_walk("/api/results", "claims", "claim_id", 4, query), pages)
+
+    def test_audit_cursor_walk_matches_page_walk(self):
+        for page_size in (1, 7, TIE_RUN):
+            with self.subTest(page_size=page_size):
+                pages = self.page_walk("/api/audit", "audits", "id", page_size)
+                cursors = self.cursor_walk("/api/audit", "audits", "id", page_size)
+                self.assertEqual(len(pages), ROWS)
+                self.assertEqual(cursors, pages)
+
+    def test_audit_cursor_encodes_timestamp(self):
+        body = self.client.get("/api/audit?page_size=3", headers=self.auth()).get_json()
+        last = body["audits"][-1]
+        expected = urlsafe_b64encode(f"{last['timestamp']}|{last['id']}".encode()).decode()
+        self.assertEqual(body["pagination"]["next_cursor"], expected)
+
+    def test_last_page_has_no_cursor(self):
+        body = self.client.get(f"/api/results?page_size={ROWS}", headers=self.auth()).get_json()
+        self.assertIsNotNone(body["pagination"]["next_cursor"])
+        body = self.client.get(f"/api/results?page_size={ROWS + 1}", headers=self.auth()).get_json()
+        self.assertIsNone(body["pagination"]["next_cursor"])
+
+    def test_malformed_cursor_is_rejected(self):
+        bad = [
+            "%%%",
+            urlsafe_b64encode(b"no-separator").decode(),
+            urlsafe_b64encode(b"not-a-date|1").decode(),
+            urlsafe_b64encode(b"2025-01-01T12:00:00|abc").decode(),
+            urlsafe_b64encode(b"\xff\xfe").decode(),
+        ]
+        for path in ("/api/results", "/api/audit"):
+            for cursor in bad:
+                with self.subTest(path=path, cursor=cursor):
+                    resp = self.client.get(f"{path}?cursor={cursor}", headers=self.auth())
+                    self.assertEqual(resp.status_code, 400)
+                    self.assertEqual(resp.get_json(), {"message": "invalid cursor"})
+
+
+class TestStreamedResults(ApiTestCase):
+    """Pages over _MAX_PAGE_SIZE are streamed with the same body jsonify would produce"""
+
+    rows = 1005
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            db.session.execute(Master.__table__.insert(), [
+                {
+                    "claim_id": f"C{i:05d}",
+                    "service_code": "SRV1001",
+                    "diagnosis_codes": ["E11.9"],
+                    "paid_amount_aed": 100 + i,
+                    "status": "Validated",
+                    "error_type": "No error",
+                    "error_explanation": [],
+                    "recommended_action": [],
+                    "tenant_id": self.tenant_id,
+                    "created_at": BASE_TIME + timedelta(seconds=i // TIE_RUN),
+                    "updated_at": BASE_TIME,
+                }
+                for i in range(self.rows)
+            ])
+            db.session.add(Metrics(tenant_id=self.tenant_id, error_category="No error", claim_count=self.rows, paid_sum=1234.5))
+            db.session.commit()
+
+    def fetch(self, query: str):
+        """(response, whether it was streamed) for a /results query, with the body read in full"""
+        # The test client wraps every body in an iterator, so streaming is detected at the source
+        with patch.object(claims, "_stream_results", wraps=claims._stream_results) as stream:
+            resp = self.client.get(f"/api/results?{query}", headers=self.auth())
+            resp.get_data()
+            resp.close()
+        return resp, stream.called
+
+    def assert_same_body(self, query: str) -> dict:
+        streamed, was_streamed = self.fetch(query)
+        with patch.object(claims, "_MAX_PAGE_SIZE", 10 ** 9):
+            materialized, was_materialized_streamed = self.fetch(query)
+        self.assertTrue(was_streamed)
+        self.assertFalse(was_materialized_streamed)
+        self.assertEqual(streamed.status_code, materialized.status_code)
+        self.assertEqual(streamed.mimetype, materialized.mimetype)
+        self.assertEqual(streamed.get_data(), materialized.get_data())
+        return streamed.get_json()
+
+    def test_full_page_matches_jsonify_with_next_cursor(self):
+        body = self.assert_same_body("page_size=1001")
+        self.assertEqual(len(body["claims"]), 1001)
+        self.assertIsNotNone(body["pagination"]["next_cursor"])
+        self.assertEqual(body["chart_data"]["claim_counts_by_error"], {"No error": self.rows})
+
+        rest = self.assert_same_body(f"page_size=1001&cursor={body['pagination']['next_cursor']}")
+        self.assertEqual(len(rest["claims"]), self.rows - 1001)
+        self.assertIsNone(rest["pagination"]["next_cursor"])
+
+    def test_partial_and_empty_pages_match_jsonify(self):
+        for query in ("page_size=2000", "page_size=1001&page=2", "page_size=1001&page=9", "page_size=1001&status=Invalid"):
+            with self.subTest(query=query):
+                self.assert_same_body(query)
+
+    def test_matches_stdlib_json_provider(self):
+        self.app.json = DefaultJSONProvider(self.app)
+        self.assert_same_body("page_size=1001")
+
+    def test_small_pages_are_not_streamed(self):
+        resp, streamed = self.fetch("page_size=1000")
+        self.assertFalse(streamed)
+        self.assertEqual(len(resp.get_json()["claims"]), 1000)
+
+
+class TestAuditPageSizeLimit(ApiTestCase):
+    """/audit has no streaming path and rejects pages over _MAX_PAGE_SIZE"""
+
+    def test_page_size_over_limit_is_rejected(self):
+        resp = self.client.get("/api/audit?page_size=1001", headers=self.auth())
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(), {"message": "page_size must be at most 1000"})
+
+    def test_page_size_at_limit_is_accepted(self):
+        resp = self.client.get("/api/audit?page_size=1000", headers=self.auth())
+        self.assertEqual(resp.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
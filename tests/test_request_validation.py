@@ -0,0 +1,106 @@
+"""
+Tests for request validation on the claims API
+"""
+
+import io
+import unittest
+from unittest.mock import patch
+from rcm_app.api import claims
+from rcm_app.extensions import db
+from rcm_app.models.models import Master
+from tests.api_case import ApiTestCase
+
+
+class TestValidateRequest(ApiTestCase):
+    """POST /api/validate checks claim_ids before any claim is loaded"""
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            db.session.add(Master(claim_id="C1", service_code="SRV2001", tenant_id=self.tenant_id))
+            db.session.commit()
+
+    def post(self, body=None, **kwargs):
+        return self.client.post("/api/validate", headers=self.auth(), json=body, **kwargs)
+
+    def test_valid_request(self):
+        resp = self.post({"claim_ids": ["C1", 2]})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_missing_claim_ids(self):
+        for body in ({}, {"claim_ids": []}, None):
+            with self.subTest(body=body):
+                resp = self.post(body)
+                self.assertEqual(resp.status_code, 400)
+                self.assertEqual(resp.get_json(), {"message": "tenant_id and claim_ids required"})
+
+    def test_claim_ids_must_be_list_of_ids(self):
+        for claim_ids in ("C1", {"id": "C1"}, ["C1", None], ["C1", ["C2"]], ["C1", 1.5], ["C1", {"id": 1}]):
+            with self.subTest(claim_ids=claim_ids):
+                resp = self.post({"claim_ids": claim_ids})
+                self.assertEqual(resp.status_code, 400)
+                self.assertEqual(resp.get_json(), {"message": "claim_ids must be a list of claim ids"})
+
+    def test_claim_ids_limit(self):
+        with patch.object(claims, "_MAX_VALIDATE_CLAIM_IDS", 3):
+            self.assertEqual(self.post({"claim_ids": ["C1", "C2", "C3"]}).status_code, 200)
+            resp = self.post({"claim_ids": ["C1", "C2", "C3", "C4"]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(), {"message": "at most 3 claim_ids per request"})
+
+    def test_non_object_json_body(self):
+        for data in (b"[1, 2]", b'"C1"', b"not json"):
+            with self.subTest(data=data):
+                resp = self.post(data=data, content_type="application/json")
+                self.assertEqual(resp.status_code, 400)
+                self.assertEqual(resp.get_json(), {"message": "tenant_id and claim_ids required"})
+
+
+class TestAgentQueryRequest(ApiTestCase):
+    """POST /api/agent tolerates bodies that are not JSON objects"""
+
+    def test_non_object_json_body(self):
+        resp = self.client.post("/api/agent", headers=self.auth(), data=b"[]", content_type="application/json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(), {"message": "tenant_id and claim_id required"})
+
+
+class TestUploadSizeLimit(ApiTestCase):
+    """Oversized uploads get a JSON 413 before the form is parsed"""
+
+    def test_oversized_upload_rejected(self):
+        self.app.config["MAX_CONTENT_LENGTH"] = 64
+        for path in ("/api/upload", "/api/adjudicate"):
+            with self.subTest(path=path):
+                data = {"file": (io.BytesIO(b"x" * 256), "claims.csv")}
+                resp = self.client.post(path, headers=self.auth(), data=data)
+                self.assertEqual(resp.status_code, 413)
+                self.assertEqual(resp.get_json(), {"message": "file too large"})
+
+    def test_unsupported_file_type(self):
+        data = {"file": (io.BytesIO(b"x"), "claims.txt")}
+        resp = self.client.post("/api/upload", headers=self.auth(), data=data)
+        self.assertEqual(resp.status_code, 415)
+
+
+class TestReloadRules(ApiTestCase):
+    """POST /api/admin/reload_rules is limited to admins"""
+
+    def test_requires_admin_role(self):
+        for roles in (None, [], ["viewer"]):
+            with self.subTest(roles=roles):
+                resp = self.client.post("/api/admin/reload_rules", headers=self.auth(roles=roles), json={})
+                self.assertEqual(resp.status_code, 403)
+
+    def test_admin_clears_tenant_bundle(self):
+        claims._TENANT_LOADER.load_rules_for_tenant(self.tenant_id)
+        headers = self.auth(roles=["admin"])
+        resp = self.client.post("/api/admin/reload_rules", headers=headers, json={"tenant_id": self.tenant_id})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), {"cleared": 1})
+        resp = self.client.post("/api/admin/reload_rules", headers=headers, json={"tenant_id": self.tenant_id})
+        self.assertEqual(resp.get_json(), {"cleared": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
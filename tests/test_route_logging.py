@@ -0,0 +1,64 @@
+"""
+Tests for route logging at app start-up
+"""
+
+import logging
+import os
+import unittest
+from unittest.mock import patch
+from tests.api_case import ApiTestCase
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class RouteLoggingCase(ApiTestCase):
+    """Builds the app with LOG_ROUTES set, recording the app logger without changing its level"""
+
+    log_routes = None
+
+    def setUp(self):
+        self.handler = _Records()
+        logger = logging.getLogger("rcm_app")
+        logger.addHandler(self.handler)
+        self.addCleanup(logger.removeHandler, self.handler)
+        env = {"LOG_ROUTES": self.log_routes} if self.log_routes else {}
+        with patch.dict(os.environ, env):
+            if not self.log_routes:
+                os.environ.pop("LOG_ROUTES", None)
+            super().setUp()
+
+    def routes(self) -> list:
+        return [record for record in self.handler.records if record.getMessage().startswith("route: ")]
+
+
+class TestLogRoutes(RouteLoggingCase):
+    """LOG_ROUTES=1 logs routes at INFO even when the logger only passes warnings"""
+
+    log_routes = "1"
+
+    def test_routes_logged_at_info(self):
+        routes = self.routes()
+        self.assertTrue(any(record.getMessage().endswith(" /api/agent") for record in routes))
+        self.assertEqual({record.levelno for record in routes}, {logging.INFO})
+
+    def test_logger_level_restored(self):
+        self.assertEqual(self.app.logger.level, logging.NOTSET)
+
+
+class TestRoutesNotLogged(RouteLoggingCase):
+    """Without LOG_ROUTES or debug mode nothing is logged"""
+
+    def test_no_routes_logged(self):
+        self.assertFalse(self.app.debug)
+        self.assertEqual(self.routes(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
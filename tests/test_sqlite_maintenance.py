@@ -0,0 +1,72 @@
+"""
+Tests for when SQLite planner statistics are refreshed
+"""
+
+import gc
+import io
+import shutil
+import tempfile
+import unittest
+import weakref
+from sqlalchemy import event
+from rcm_app import create_app
+from rcm_app.extensions import db
+from rcm_app.settings import AppConfig
+from rcm_app.utils import sqlite
+from tests.api_case import ApiTestCase
+from tests.test_upload_jobs import CSV
+
+
+class TestOptimizeSchedule(ApiTestCase):
+    """PRAGMA optimize runs after bulk ingestion, not on every request"""
+
+    def optimize_statements(self) -> list:
+        """PRAGMA optimize statements run on the app's engine from now on"""
+        seen = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.strip().upper() == "PRAGMA OPTIMIZE":
+                seen.append(statement)
+
+        with self.app.app_context():
+            bound = db.engine
+        event.listen(bound, "before_cursor_execute", record)
+        self.addCleanup(event.remove, bound, "before_cursor_execute", record)
+        return seen
+
+    def test_requests_do_not_optimize(self):
+        seen = self.optimize_statements()
+        self.client.get("/api/results", headers=self.auth())
+        self.client.get("/api/audit", headers=self.auth())
+        self.client.get("/health")
+        self.assertEqual(seen, [])
+
+    def test_upload_optimizes_once_after_ingest(self):
+        seen = self.optimize_statements()
+        data = {"file": (io.BytesIO(CSV), "claims.csv")}
+        resp = self.client.post("/api/upload", headers=self.auth(), data=data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(seen), 1)
+
+
+class TestExitHook(unittest.TestCase):
+    """The process-wide exit hook does not keep dropped apps alive"""
+
+    def test_dropped_app_is_collected(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, True)
+        cfg = AppConfig.from_env()
+        cfg.database_url = f"sqlite:///{tmpdir}/rcm.db"
+        app = create_app(cfg)
+        with app.app_context():
+            bound = db.engine
+        self.assertIn(bound, sqlite._EXIT_ENGINES)
+        bound.dispose()
+        app_ref = weakref.ref(app)
+        del app, bound
+        gc.collect()
+        self.assertIsNone(app_ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
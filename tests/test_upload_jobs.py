@@ -0,0 +1,101 @@
+"""
+Tests for background uploads and GET /api/jobs/<job_id>
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from rcm_app.api import claims
+from rcm_app.pipeline import jobs
+from tests.api_case import ApiTestCase
+
+CSV = (
+    b"encounter_type,service_date,national_id,member_id,facility_id,unique_id,diagnosis_codes,"
+    b"approval_number,service_code,paid_amount_aed\n"
+    b"INPATIENT,5/3/2024,J45NUMBE,UZF615NA,0DBYE6KP,J45N-UZF6-E6KP,E66.9,NA,SRV1003,559.91\n"
+    b"INPATIENT,1/13/2025,SYWX6RYN,B1G36XGM,OCQUMGDW,SYWX-G36X-MGDW,E66.3;R07.9,Obtain approval,SRV2001,1077.6\n"
+)
+
+
+class TestUploadJobs(ApiTestCase):
+    """Jobs are queued by /upload?async=1 and readable only by their owner"""
+
+    def setUp(self):
+        super().setUp()
+        # Capture submitted jobs instead of running them, so each test steps them explicitly
+        self.executor = Mock()
+        patcher = patch.object(jobs, "_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _submit(self, content: bytes, headers: dict, **form) -> str:
+        data = {"file": (io.BytesIO(content), "claims.csv"), **form}
+        resp = self.client.post("/api/upload?async=1", data=data, headers=headers)
+        self.assertEqual(resp.status_code, 202)
+        return resp.get_json()["job_id"]
+
+    def _run_queued(self) -> None:
+        for call in self.executor.submit.call_args_list:
+            call.args[0]()
+
+    def test_queued_then_finished(self):
+        headers = self.auth()
+        job_id = self._submit(CSV, headers)
+
+        job = self.client.get(f"/api/jobs/{job_id}", headers=headers).get_json()
+        self.assertEqual(job["status"], "queued")
+
+        self._run_queued()
+        job = self.client.get(f"/api/jobs/{job_id}", headers=headers).get_json()
+        self.assertEqual(job["status"], "finished")
+        self.assertIn("finished_at", job)
+        self.assertIsInstance(job["result"], dict)
+
+    def test_unparseable_upload_fails(self):
+        headers = self.auth()
+        job_id = self._submit(b"", headers)
+        self._run_queued()
+
+        job = self.client.get(f"/api/jobs/{job_id}", headers=headers).get_json()
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("failed to parse file", job["error"])
+
+    def test_other_tenant_gets_404(self):
+        job_id = self._submit(CSV, self.auth())
+        resp = self.client.get(f"/api/jobs/{job_id}", headers=self.auth("other_tenant"))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_unknown_job_gets_404(self):
+        resp = self.client.get("/api/jobs/does-not-exist", headers=self.auth())
+        self.assertEqual(resp.status_code, 404)
+
+    def test_form_tenant_override_keeps_caller_as_owner(self):
+        headers = self.auth()
+        job_id = self._submit(CSV, headers, tenant_id="other_tenant")
+        resp = self.client.get(f"/api/jobs/{job_id}", headers=headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.client.get(f"/api/jobs/{job_id}", headers=self.auth("other_tenant")).status_code, 404)
+
+    def test_spooled_file_removed_when_submit_fails(self):
+        paths = []
+        real_mkstemp = tempfile.mkstemp
+
+        def mkstemp(*args, **kwargs):
+            fd, path = real_mkstemp(*args, **kwargs)
+            paths.append(path)
+            return fd, path
+
+        with patch.object(claims.tempfile, "mkstemp", side_effect=mkstemp), \
+                patch.object(claims, "submit_job", side_effect=RuntimeError("pool closed")):
+            data = {"file": (io.BytesIO(CSV), "claims.csv")}
+            resp = self.client.post("/api/upload?async=1", data=data, headers=self.auth())
+
+        self.assertEqual(resp.status_code, 500)
+        self.assertEqual(len(paths), 1)
+        self.assertFalse(os.path.exists(paths[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()